@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Composition Benchmarks for Lab 4: OOP Design and Polymorphism
+CSC3301 Programming Language Paradigms
+
+Measures the Task 3 Vehicle/Feature composition at fleet scale.
+
+Usage:
+    python scripts/bench_composition.py [benchmark ...] [--n N]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.task3_composition import (  # noqa: E402
+    Engine, Feature, Fleet, Propeller, Vehicle, Wheels, Wings,
+)
+
+COMBINATIONS = [
+    ("Car", (Engine, Wheels)),
+    ("Boat", (Engine, Propeller)),
+    ("Plane", (Engine, Wings, Wheels)),
+    ("Glider", (Wings,)),
+]
+
+
+def make_fleet(n: int) -> list[Vehicle]:
+    """n vehicles cycling through a few feature combinations."""
+    fleet = []
+    for i in range(n):
+        name, kinds = COMBINATIONS[i % len(COMBINATIONS)]
+        fleet.append(Vehicle(f"{name}-{i}", [kind() for kind in kinds]))
+    return fleet
+
+
+def rate(run, n: int) -> float:
+    """Items per second for a zero-argument callable processing n items."""
+    start = time.perf_counter()
+    run()
+    return n / (time.perf_counter() - start)
+
+
+def bench_has_feature(n: int) -> None:
+    """has_feature() via the type index vs a linear isinstance() scan."""
+    fleet = make_fleet(n)
+
+    def linear(vehicle, feature_type):
+        # The isinstance() scan has_feature() would otherwise need
+        return any(isinstance(f, feature_type) for f in vehicle._features)
+
+    print(f"{'query':<12}{'linear scan/s':>16}{'type index/s':>16}")
+    for feature_type in (Engine, Wheels, Feature):
+        scan = rate(lambda: [linear(v, feature_type) for v in fleet], n)
+        indexed = rate(lambda: [v.has_feature(feature_type) for v in fleet], n)
+        print(f"{feature_type.__name__:<12}{scan:>16,.0f}{indexed:>16,.0f}")
+
+
+def bench_fleet(n: int) -> None:
+    """'Engine and Wings but no Wheels' over a fleet: has_feature loop vs Fleet bitmasks."""
+    vehicles = make_fleet(n)
+    fleet = Fleet(vehicles)
+
+    def loop():
+        return [v for v in vehicles
+                if v.has_feature(Engine) and v.has_feature(Wings) and not v.has_feature(Wheels)]
+
+    print(f"{'path':<18}{'vehicles/s':>16}")
+    print(f"{'has_feature loop':<18}{rate(loop, n):>16,.0f}")
+    print(f"{'Fleet.query':<18}"
+          f"{rate(lambda: fleet.query(all_of=[Engine, Wings], none_of=[Wheels]), n):>16,.0f}")
+    print(f"{'Fleet.count':<18}"
+          f"{rate(lambda: fleet.count(all_of=[Engine, Wings], none_of=[Wheels]), n):>16,.0f}")
+
+
+# Without __slots__ = () these subclasses are not shared: each call is a new object
+class FreshEngine(Engine):
+    pass
+
+
+class FreshWheels(Wheels):
+    pass
+
+
+class ListVehicle:
+    """A vehicle as a plain object holding a fresh list of fresh features."""
+
+    def __init__(self, name, features):
+        self.name = name
+        self.features = list(features)
+
+
+def bench_memory(n: int) -> None:
+    """Bytes per vehicle: fresh features in lists vs shared features in Vehicle."""
+    variants = {
+        "fresh features": lambda: [ListVehicle(f"Car-{i}", [FreshEngine(), FreshWheels()])
+                                   for i in range(n)],
+        "shared features": lambda: [Vehicle(f"Car-{i}", [Engine(), Wheels()])
+                                    for i in range(n)],
+    }
+    print(f"{'representation':<18}{'bytes/vehicle':>16}{'vehicles/s':>16}")
+    for name, build in variants.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        fleet = build()
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del fleet
+        print(f"{name:<18}{current / n:>16.1f}{n / elapsed:>16,.0f}")
+
+
+BENCHMARKS = {
+    "has_feature": bench_has_feature,
+    "fleet": bench_fleet,
+    "memory": bench_memory,
+}
+
+
+def main():
+    """Run the named benchmarks (all of them by default)."""
+    args = sys.argv[1:]
+    n = 200_000
+    if "--n" in args:
+        i = args.index("--n")
+        n = int(args[i + 1])
+        del args[i:i + 2]
+
+    names = args or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        print(f"\n== {name} (n={n:,}) ==")
+        BENCHMARKS[name](n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Payment Benchmarks for Lab 4: OOP Design and Polymorphism
+CSC3301 Programming Language Paradigms
+
+Measures throughput of the Task 2 payment strategies.
+
+Usage:
+    python scripts/bench_payment.py [benchmark ...] [--n N]
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import ROUND_HALF_EVEN, Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.task2_payment import (  # noqa: E402
+    CompositeStrategy, CreditCardPayment, CryptoPayment, PaymentProcessor,
+    PaymentMetrics, PaymentStrategy, PayPalPayment, StrategyRegistry,
+    TieredFeePayment,
+)
+from src.payment_async import AsyncPaymentProcessor, FakeGateway  # noqa: E402
+from src.payment_ledger import LedgerReader, TransactionLedger  # noqa: E402
+
+
+class Wrapped(PaymentStrategy):
+    """Naive chaining: apply an inner strategy, then an outer one."""
+
+    def __init__(self, inner: PaymentStrategy, outer: PaymentStrategy):
+        self.inner = inner
+        self.outer = outer
+
+    def process_payment(self, amount: float) -> float:
+        return self.outer.process_payment(self.inner.process_payment(amount))
+
+
+def make_amounts(n: int) -> list[float]:
+    """Deterministic payment amounts between 1.00 and 1000.00."""
+    return [1.0 + (i * 37 % 99_900) / 100 for i in range(n)]
+
+
+def rate(run, n: int) -> float:
+    """Items per second for a zero-argument callable processing n items."""
+    start = time.perf_counter()
+    run()
+    return n / (time.perf_counter() - start)
+
+
+def bench_batch(n: int) -> None:
+    """Compare one checkout() call per amount against checkout_many()."""
+    amounts = make_amounts(n)
+    print(f"{'strategy':<20}{'checkout/s':>16}{'checkout_many/s':>18}")
+    for strategy in (CreditCardPayment(2.5), PayPalPayment(3.0), CryptoPayment(5.0)):
+        processor = PaymentProcessor(strategy)
+        scalar = rate(lambda: [processor.checkout(a) for a in amounts], n)
+        batch = rate(lambda: processor.checkout_many(amounts), n)
+        print(f"{type(strategy).__name__:<20}{scalar:>16,.0f}{batch:>18,.0f}")
+
+
+def bench_fixed_point(n: int) -> None:
+    """Compare integer-cents checkout against an equivalent Decimal implementation."""
+    cents = [round(a * 100) for a in make_amounts(n)]
+    decimals = [Decimal(c) / 100 for c in cents]
+    processor = PaymentProcessor(CreditCardPayment(2.9))
+    factor = 1 + Decimal("2.9") / 100
+    quantum = Decimal("0.01")
+
+    def with_decimal():
+        return [(d * factor).quantize(quantum, ROUND_HALF_EVEN) for d in decimals]
+
+    print(f"{'path':<18}{'checkouts/s':>16}")
+    print(f"{'Decimal':<18}{rate(with_decimal, n):>16,.0f}")
+    print(f"{'integer cents':<18}{rate(lambda: processor.checkout_many_cents(cents), n):>16,.0f}")
+
+
+def bench_composite(n: int) -> None:
+    """Compare naive wrapped chains against CompositeStrategy for 2..8 stages."""
+    amounts = make_amounts(n)
+    print(f"{'stages':<10}{'wrapped/s':>16}{'composite/s':>16}")
+    for depth in (2, 4, 8):
+        stages = [CreditCardPayment(2.5) if i % 2 else CryptoPayment(1.0) for i in range(depth)]
+        wrapped = stages[0]
+        for stage in stages[1:]:
+            wrapped = Wrapped(wrapped, stage)
+        composite = CompositeStrategy(*stages)
+        naive = rate(lambda: [wrapped.process_payment(a) for a in amounts], n)
+        fused = rate(lambda: [composite.process_payment(a) for a in amounts], n)
+        print(f"{depth:<10}{naive:>16,.0f}{fused:>16,.0f}")
+
+
+def bench_async(n: int) -> None:
+    """Checkouts per second through a 10 ms fake gateway at several concurrency limits."""
+    amounts = make_amounts(min(n, 2_000))
+    print(f"{'concurrency':<14}{'checkouts/s':>16}")
+    for limit in (1, 10, 100, 1000):
+        processor = AsyncPaymentProcessor(FakeGateway(CreditCardPayment(2.5), latency=0.01),
+                                          max_concurrency=limit)
+        batch = amounts[:100] if limit == 1 else amounts  # serial is slow; sample it
+        throughput = rate(lambda: asyncio.run(processor.checkout_many(batch)), len(batch))
+        print(f"{limit:<14}{throughput:>16,.0f}")
+
+
+# Runs in a fresh interpreter so module imports and entry-point discovery are cold
+_REGISTRY_PROBE = """
+import json, time
+start = time.perf_counter()
+from src.task2_payment import strategies
+imported = time.perf_counter()
+strategies.create("credit_card", 2.5)
+builtin = time.perf_counter()
+strategies.create("plugin_0", 2.5)
+plugin = time.perf_counter()
+print(json.dumps([imported - start, builtin - imported, plugin - builtin]))
+"""
+
+
+def _fake_plugin_dist(root: Path, plugins: int) -> None:
+    """Install-free distribution advertising ``plugins`` strategy entry points."""
+    dist = root / "lab4_fake_plugins-1.0.dist-info"
+    dist.mkdir()
+    (dist / "METADATA").write_text("Metadata-Version: 2.1\nName: lab4-fake-plugins\nVersion: 1.0\n")
+    lines = [f"[{StrategyRegistry.ENTRY_POINT_GROUP}]"]
+    lines += [f"plugin_{i} = src.task2_payment:CreditCardPayment" for i in range(plugins)]
+    (dist / "entry_points.txt").write_text("\n".join(lines) + "\n")
+
+
+def bench_registry(n: int) -> None:
+    """Cold-start cost in a fresh interpreter as the number of installed plugins grows."""
+    repo = str(Path(__file__).parent.parent)
+    print(f"{'plugins':<10}{'import (ms)':>14}{'builtin lookup (ms)':>22}"
+          f"{'first plugin (ms)':>20}")
+    for plugins in (1, 1_000, 100_000):
+        with tempfile.TemporaryDirectory() as tmp:
+            _fake_plugin_dist(Path(tmp), plugins)
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join([repo, tmp]))
+            output = subprocess.run([sys.executable, "-c", _REGISTRY_PROBE], env=env,
+                                    check=True, capture_output=True, text=True).stdout
+        imported, builtin, plugin = (seconds * 1000 for seconds in json.loads(output))
+        print(f"{plugins:<10}{imported:>14.2f}{builtin:>22.3f}{plugin:>20.2f}")
+
+
+def bench_ledger(n: int) -> None:
+    """Ledger records per second across durability settings, plus replay speed."""
+    settings = {
+        "fsync every record": dict(batch_size=1, sync_interval=None),
+        "fsync every 100": dict(batch_size=100, sync_interval=None),
+        "fsync every 10k": dict(batch_size=10_000, sync_interval=None),
+        "fsync every 1s": dict(batch_size=10**9, sync_interval=1.0),
+        "no fsync": dict(batch_size=10_000, sync_interval=None, fsync=False),
+    }
+    amounts = make_amounts(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'setting':<22}{'records/s':>16}")
+        for i, (name, options) in enumerate(settings.items()):
+            # Per-record fsync is slow on most disks; time a sample of it
+            batch = amounts[:2_000] if options["batch_size"] == 1 else amounts
+            path = Path(tmp) / f"bench-{i}.ledger"
+            with TransactionLedger(path, **options) as ledger:
+                processor = PaymentProcessor(CreditCardPayment(2.5), ledger=ledger)
+                throughput = rate(lambda: [processor.checkout(a) for a in batch], len(batch))
+            print(f"{name:<22}{throughput:>16,.0f}")
+        with LedgerReader(path) as reader:
+            print(f"{'replay totals()':<22}{rate(reader.totals, len(reader)):>16,.0f}")
+
+
+def bench_metrics(n: int) -> None:
+    """Per-checkout cost of metrics collection, disabled vs enabled."""
+    amounts = make_amounts(n)
+    plain = PaymentProcessor(CreditCardPayment(2.5))
+    measured = PaymentProcessor(CreditCardPayment(2.5), metrics=PaymentMetrics())
+    # Alternate the two runs and keep the fastest of each, so that a noisy
+    # neighbour does not land on one side of the comparison only.
+    disabled = enabled = float("inf")
+    for _ in range(5):
+        disabled = min(disabled, 1e9 / rate(lambda: [plain.checkout(a) for a in amounts], n))
+        enabled = min(enabled, 1e9 / rate(lambda: [measured.checkout(a) for a in amounts], n))
+    print(f"{'metrics':<12}{'ns/checkout':>14}")
+    print(f"{'disabled':<12}{disabled:>14.0f}")
+    print(f"{'enabled':<12}{enabled:>14.0f}")
+    print(f"{'overhead':<12}{enabled - disabled:>14.0f}")
+
+
+def bench_tiered(n: int) -> None:
+    """Bulk pricing with 48 fee tiers compared to a flat-fee strategy."""
+    amounts = make_amounts(n)
+    tiers = [(i * 25.0, 3.0 - i * 0.05) for i in range(48)]
+    variants = {
+        "flat fee": CreditCardPayment(2.5),
+        "tiered (flat)": TieredFeePayment(tiers, mode="flat"),
+        "tiered (marginal)": TieredFeePayment(tiers, mode="marginal"),
+    }
+    print(f"{'strategy':<20}{'process_payments/s':>20}")
+    for name, strategy in variants.items():
+        print(f"{name:<20}{rate(lambda: strategy.process_payments(amounts), n):>20,.0f}")
+
+
+BENCHMARKS = {
+    "batch": bench_batch,
+    "fixed_point": bench_fixed_point,
+    "composite": bench_composite,
+    "async": bench_async,
+    "registry": bench_registry,
+    "ledger": bench_ledger,
+    "metrics": bench_metrics,
+    "tiered": bench_tiered,
+}
+
+
+def main():
+    """Run the named benchmarks (all of them by default)."""
+    args = sys.argv[1:]
+    n = 200_000
+    if "--n" in args:
+        i = args.index("--n")
+        n = int(args[i + 1])
+        del args[i:i + 2]
+
+    names = args or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        print(f"\n== {name} (n={n:,}) ==")
+        BENCHMARKS[name](n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Shape Benchmarks for Lab 4: OOP Design and Polymorphism
+CSC3301 Programming Language Paradigms
+
+Measures memory and throughput of the Task 1 shape hierarchy.
+
+Usage:
+    python scripts/bench_shapes.py [benchmark ...] [--n N]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.task1_shapes import (  # noqa: E402
+    Circle, Rectangle, Square, Triangle, ShapeBatch, ShapeInterner,
+    parallel_total_area, total_area, triangle_areas, triangle_mask,
+)
+
+
+# Dict-backed equivalents of the shape classes, used as the memory baseline.
+class DictCircle:
+    def __init__(self, radius):
+        self.radius = radius
+
+
+class DictRectangle:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+
+class DictSquare(DictRectangle):
+    def __init__(self, side):
+        super().__init__(side, side)
+
+
+class DictTriangle:
+    def __init__(self, side_a, side_b, side_c):
+        self.side_a = side_a
+        self.side_b = side_b
+        self.side_c = side_c
+
+
+def make_shapes(n: int, circle=Circle, rectangle=Rectangle, square=Square,
+                triangle=Triangle) -> list:
+    """Build n shapes cycling through the four concrete kinds."""
+    shapes = []
+    append = shapes.append
+    for i in range(n):
+        x = 1.0 + (i % 97) / 10
+        kind = i % 4
+        if kind == 0:
+            append(circle(x))
+        elif kind == 1:
+            append(rectangle(x, x + 1.0))
+        elif kind == 2:
+            append(square(x))
+        else:
+            append(triangle(x + 2.0, x + 3.0, x + 4.0))
+    return shapes
+
+
+def measure(build, n: int) -> tuple[float, float]:
+    """Return (bytes per shape, shapes per second) for a builder callable."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / n, n / elapsed
+
+
+def bench_memory(n: int) -> None:
+    """Compare bytes-per-shape and construction rate across representations."""
+    variants = {
+        "dict-backed": lambda k: make_shapes(k, DictCircle, DictRectangle,
+                                             DictSquare, DictTriangle),
+        "slots": make_shapes,
+        "ShapeBatch": lambda k: ShapeBatch.from_shapes(make_shapes(k)),
+    }
+    print(f"{'representation':<16}{'bytes/shape':>14}{'shapes/s':>16}")
+    for name, build in variants.items():
+        per_shape, rate = measure(build, n)
+        print(f"{name:<16}{per_shape:>14.1f}{rate:>16,.0f}")
+
+
+def best_of(run, repeat: int = 5) -> float:
+    """Fastest of several timed runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_throughput(n: int) -> None:
+    """Total area per second: polymorphic area() loop vs ShapeBatch column passes."""
+    shapes = make_shapes(n)
+    batch = ShapeBatch.from_shapes(shapes)
+    variants = {
+        "total_area(list)": lambda: total_area(shapes),
+        "batch.total_area": batch.total_area,
+        "from_shapes+total": lambda: ShapeBatch.from_shapes(shapes).total_area(),
+    }
+    print(f"{'path':<20}{'shapes/s':>16}{'speedup':>10}")
+    baseline = None
+    for name, run in variants.items():
+        elapsed = best_of(run)
+        baseline = baseline or elapsed
+        print(f"{name:<20}{n / elapsed:>16,.0f}{baseline / elapsed:>10.2f}")
+
+
+def bench_parallel(n: int) -> None:
+    """Time parallel_total_area on a list and on a ShapeBatch for 1..cpu_count workers."""
+    shapes = make_shapes(n)
+    batch = ShapeBatch.from_shapes(shapes)
+
+    serial = best_of(lambda: total_area(shapes), repeat=3)
+    print(f"{'input':<8}{'workers':<10}{'seconds':>10}{'speedup':>10}")
+    print(f"{'list':<8}{'serial':<10}{serial:>10.3f}{1.0:>10.2f}")
+
+    # The list rows include every cost the caller pays; the batch rows assume
+    # the ShapeBatch already exists (see the throughput benchmark for its build cost)
+    for label, data in (("list", shapes), ("batch", batch)):
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            elapsed = best_of(
+                lambda: parallel_total_area(data, workers=workers, threshold=0), repeat=3)
+            print(f"{label:<8}{workers:<10}{elapsed:>10.3f}{serial / elapsed:>10.2f}")
+            workers *= 2
+
+
+def bench_intern(n: int) -> None:
+    """Bytes per shape for a duplicate-heavy input, plain vs interned."""
+    interner = ShapeInterner()
+
+    def interned(k):
+        get = interner.get
+        return [get(Square, float(i % 50)) for i in range(k)]
+
+    variants = {
+        "plain": lambda k: [Square(float(i % 50)) for i in range(k)],
+        "interned": interned,
+    }
+    print(f"{'representation':<16}{'bytes/shape':>14}{'shapes/s':>16}")
+    for name, build in variants.items():
+        per_shape, rate = measure(build, n)
+        print(f"{name:<16}{per_shape:>14.1f}{rate:>16,.0f}")
+
+
+def bench_triangles(n: int) -> None:
+    """Rows per second for batch triangle validation and area vs Triangle objects."""
+    a = [3.0 + (i % 97) / 10 for i in range(n)]
+    b = [x + 1.0 for x in a]
+    c = [x + 2.0 for x in a]
+
+    def objects():
+        return [Triangle(x, y, z).area() for x, y, z in zip(a, b, c)]
+
+    variants = {
+        "Triangle objects": objects,
+        "triangle_mask": lambda: triangle_mask(a, b, c),
+        "triangle_areas": lambda: triangle_areas(a, b, c),
+    }
+    print(f"{'path':<18}{'rows/s':>16}")
+    for name, run in variants.items():
+        start = time.perf_counter()
+        run()
+        print(f"{name:<18}{n / (time.perf_counter() - start):>16,.0f}")
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "throughput": bench_throughput,
+    "parallel": bench_parallel,
+    "intern": bench_intern,
+    "triangles": bench_triangles,
+}
+
+
+def main():
+    """Run the named benchmarks (all of them by default)."""
+    args = sys.argv[1:]
+    n = 200_000
+    if "--n" in args:
+        i = args.index("--n")
+        n = int(args[i + 1])
+        del args[i:i + 2]
+
+    names = args or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        print(f"\n== {name} (n={n:,}) ==")
+        BENCHMARKS[name](n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Asynchronous payment processing for the Task 2 Strategy pattern.
+
+Real payment strategies usually wait on a remote gateway, so running them one
+at a time leaves the process idle for most of each call. This module provides
+an async version of the strategy interface and an AsyncPaymentProcessor that
+runs many checkouts concurrently, bounded by a configurable limit, with
+per-call timeouts. Cancelling a checkout_many() call cancels every
+checkout it started.
+
+FakeGateway wraps any synchronous PaymentStrategy with a configurable
+delay, so concurrency gains can be measured without a network.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+from src.task2_payment import PaymentStrategy
+
+
+class AsyncPaymentStrategy(ABC):
+    """
+    Abstract base class for payment strategies that await I/O.
+    """
+
+    @abstractmethod
+    async def process_payment(self, amount: float) -> float:
+        """
+        Process a payment and return the final amount after fees or discounts.
+
+        Args:
+            amount: The base payment amount in dollars
+
+        Returns:
+            The final amount after applying fees or discounts
+        """
+        pass
+
+
+class SyncStrategyAdapter(AsyncPaymentStrategy):
+    """
+    Use an ordinary (CPU-only) PaymentStrategy where an async one is expected.
+    """
+
+    def __init__(self, strategy: PaymentStrategy):
+        """
+        Args:
+            strategy: The synchronous strategy to delegate to
+        """
+        self.strategy = strategy
+
+    async def process_payment(self, amount: float) -> float:
+        return self.strategy.process_payment(amount)
+
+
+class FakeGateway(AsyncPaymentStrategy):
+    """
+    In-process stand-in for a remote payment gateway.
+
+    Each call sleeps for ``latency`` seconds before applying the wrapped
+    strategy, simulating a network round trip. ``calls`` counts every call,
+    ``in_flight`` the calls currently sleeping and ``peak_in_flight`` the
+    most that were ever in flight at once.
+    """
+
+    def __init__(self, strategy: PaymentStrategy, latency: float = 0.01):
+        """
+        Args:
+            strategy: The strategy whose result the gateway returns
+            latency: Simulated round-trip time in seconds
+        """
+        self.strategy = strategy
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def process_payment(self, amount: float) -> float:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return self.strategy.process_payment(amount)
+
+
+class AsyncPaymentProcessor:
+    """
+    Async context class for the Strategy pattern.
+
+    At most ``max_concurrency`` strategy calls are in flight at once, across
+    every checkout() and checkout_many() on this processor. The limit is
+    enforced per event loop, so one processor can be reused across separate
+    ``asyncio.run()`` calls.
+    """
+
+    def __init__(self, strategy: AsyncPaymentStrategy, max_concurrency: int = 10,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the processor.
+
+        Args:
+            strategy: The async strategy to process payments with
+            max_concurrency: Maximum number of concurrent strategy calls
+            timeout: Default per-call timeout in seconds (None for no limit)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.strategy = strategy
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def set_strategy(self, strategy: AsyncPaymentStrategy) -> None:
+        """
+        Change the payment strategy; checkouts already in flight keep the old one.
+
+        Args:
+            strategy: A new AsyncPaymentStrategy to use
+        """
+        self.strategy = strategy
+
+    async def checkout(self, amount: float, timeout: Optional[float] = None) -> float:
+        """
+        Process one payment.
+
+        Args:
+            amount: The base payment amount
+            timeout: Per-call timeout in seconds, overriding the default
+
+        Returns:
+            The final amount after the strategy has processed it
+
+        Raises:
+            asyncio.TimeoutError: If the strategy call exceeds the timeout
+        """
+        strategy = self.strategy
+        async with self._limiter():
+            return await asyncio.wait_for(
+                strategy.process_payment(amount),
+                self.timeout if timeout is None else timeout,
+            )
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # asyncio primitives bind to the first loop that waits on them, so the
+        # semaphore is created on first use and replaced when the loop changes.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def checkout_many(self, amounts: Sequence[float],
+                            timeout: Optional[float] = None) -> list[float]:
+        """
+        Process a batch of payments concurrently.
+
+        Only ``max_concurrency`` worker tasks are created, however long the
+        batch is. If any payment fails or the call is cancelled, the
+        remaining payments are cancelled and the error propagates.
+
+        Args:
+            amounts: The base payment amounts
+            timeout: Per-call timeout in seconds, overriding the default
+
+        Returns:
+            The final amount for each input, in order
+        """
+        results: list = [None] * len(amounts)
+        pending = iter(enumerate(amounts))
+
+        async def worker():
+            for index, amount in pending:
+                results[index] = await self.checkout(amount, timeout)
+
+        workers = [asyncio.ensure_future(worker())
+                   for _ in range(min(self.max_concurrency, len(amounts)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return results
@@ -0,0 +1,255 @@
+"""
+Append-only transaction ledger for the Task 2 PaymentProcessor.
+
+Every checkout can be written to a local log file as a fixed-size binary
+record. To keep throughput high the ledger group-commits: records are
+buffered in memory and written and fsync'd together once ``batch_size``
+records are pending or ``sync_interval`` seconds have passed since the last
+sync; a background thread enforces the interval even when no further records
+arrive. Records still in the buffer are lost if the process crashes, so
+smaller settings are more durable but slower.
+
+Ledger files are read back with ``mmap``. Totals are summed straight from the
+mapped buffer. A record torn by a crash is ignored by readers and cut off
+when the ledger is next opened for writing, so later records stay aligned.
+
+File layout (little-endian):
+    header : magic b"LDG1" + 4 pad bytes
+    record : timestamp_ns (i64), amount (f64), result (f64), strategy (24-byte ASCII name)
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+MAGIC = b"LDG1"
+
+_HEADER = struct.Struct("<4s4x")
+_NAME_SIZE = 24
+_RECORD = struct.Struct(f"<qdd{_NAME_SIZE}s")
+_DOUBLES_PER_RECORD = _RECORD.size // 8
+
+
+@lru_cache(maxsize=256)
+def _encode_name(strategy: str) -> bytes:
+    """
+    Strategy name as stored in a record's 24-byte field.
+
+    Non-ASCII characters become "?". Longer names keep their first 15 bytes
+    plus "~" and an 8-hex-digit hash of the full name, so distinct strategies
+    stay distinct in totals_by_strategy().
+    """
+    name = strategy.encode("ascii", errors="replace")
+    if len(name) <= _NAME_SIZE:
+        return name
+    digest = hashlib.blake2b(strategy.encode("utf-8"), digest_size=4).hexdigest()
+    return name[:_NAME_SIZE - 9] + b"~" + digest.encode("ascii")
+
+
+class LedgerRecord(NamedTuple):
+    """One checkout as stored in the ledger."""
+
+    timestamp_ns: int
+    amount: float
+    result: float
+    strategy: str
+
+
+class TransactionLedger:
+    """
+    Group-committing writer for ledger files.
+
+    Pass an instance to ``PaymentProcessor(..., ledger=...)`` and every
+    checkout is recorded. Safe to share between threads. Call close() (or use
+    it as a context manager) to stop the background flusher.
+    """
+
+    def __init__(self, path, batch_size: int = 1000,
+                 sync_interval: Optional[float] = 1.0, fsync: bool = True):
+        """
+        Open (or create) a ledger file for appending.
+
+        Args:
+            path: Ledger file path
+            batch_size: Commit once this many records are pending (1 commits
+                every record)
+            sync_interval: Also commit pending records once this many seconds
+                have passed since the last commit, from a background thread
+                if no record arrives to trigger it (None to commit on batch
+                size only)
+            fsync: Whether a commit calls os.fsync; False leaves durability
+                to the operating system
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = open(self.path, "a+b")
+        try:
+            self._recover()
+        except BaseException:
+            self._file.close()
+            raise
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if sync_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="ledger-flusher", daemon=True)
+            self._flusher.start()
+
+    def _recover(self) -> None:
+        """Write the header to a new file, or drop a torn trailing record from an old one."""
+        size = self._file.seek(0, os.SEEK_END)
+        self._file.seek(0)
+        header = self._file.read(_HEADER.size)
+        if size < _HEADER.size and _HEADER.pack(MAGIC).startswith(header):
+            # New file, or a crash while the header was being written
+            self._file.truncate(0)
+            self._file.write(_HEADER.pack(MAGIC))
+            self._file.flush()
+            return
+        if len(header) < _HEADER.size or _HEADER.unpack(header)[0] != MAGIC:
+            raise ValueError(f"{self.path} is not a transaction ledger")
+        whole = size - (size - _HEADER.size) % _RECORD.size
+        if whole != size:
+            # Appending after a partial record would misalign every later one
+            self._file.truncate(whole)
+
+    def record(self, strategy: str, amount: float, result: float) -> None:
+        """Append one checkout; it is durable after the next commit."""
+        packed = _RECORD.pack(time.time_ns(), amount, result, _encode_name(strategy))
+        with self._lock:
+            self._buffer += packed
+            self._pending += 1
+            self._maybe_commit()
+
+    def record_many(self, strategy: str, amounts, results) -> None:
+        """Append one record per (amount, result) pair under a single lock."""
+        now = time.time_ns()
+        name = _encode_name(strategy)
+        pack = _RECORD.pack
+        with self._lock:
+            for amount, result in zip(amounts, results):
+                self._buffer += pack(now, amount, result, name)
+                self._pending += 1
+            self._maybe_commit()
+
+    def commit(self) -> None:
+        """Write and (optionally) fsync every buffered record now."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Stop the flusher, commit pending records and close the file."""
+        self._closing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._commit()
+                self._file.close()
+
+    def __enter__(self) -> "TransactionLedger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _maybe_commit(self) -> None:
+        if self._pending >= self.batch_size or (
+            self.sync_interval is not None
+            and time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self._commit()
+
+    def _flush_periodically(self) -> None:
+        delay = self.sync_interval
+        while not self._closing.wait(delay):
+            with self._lock:
+                if self._file.closed:
+                    return
+                delay = self._last_sync + self.sync_interval - time.monotonic()
+                if delay <= 0:
+                    if self._pending:
+                        self._commit()
+                    delay = self.sync_interval
+
+    def _commit(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+
+class LedgerReader:
+    """
+    Read-only, memory-mapped view of a ledger file.
+
+    A trailing partial record (e.g. from a crash mid-write) is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if _HEADER.unpack_from(self._mm, 0)[0] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a transaction ledger")
+        self._count = (len(self._mm) - _HEADER.size) // _RECORD.size
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "LedgerReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[LedgerRecord]:
+        unpack = _RECORD.unpack_from
+        for i in range(self._count):
+            timestamp, amount, result, name = unpack(self._mm, _HEADER.size + i * _RECORD.size)
+            strategy = name.rstrip(b"\0").decode("ascii", errors="replace")
+            yield LedgerRecord(timestamp, amount, result, strategy)
+
+    def totals(self) -> tuple[float, float]:
+        """(sum of amounts, sum of results) over every record, without unpacking."""
+        end = _HEADER.size + self._count * _RECORD.size
+        with memoryview(self._mm)[_HEADER.size:end] as raw, raw.cast("d") as doubles:
+            with doubles[1::_DOUBLES_PER_RECORD] as amounts, \
+                    doubles[2::_DOUBLES_PER_RECORD] as results:
+                return math.fsum(amounts), math.fsum(results)
+
+    def totals_by_strategy(self) -> dict[str, dict[str, float]]:
+        """Per-strategy record count, amount total and result total."""
+        amounts: dict[str, list[float]] = {}
+        results: dict[str, list[float]] = {}
+        for record in self:
+            amounts.setdefault(record.strategy, []).append(record.amount)
+            results.setdefault(record.strategy, []).append(record.result)
+        return {
+            name: {"count": len(amounts[name]), "amount": math.fsum(amounts[name]),
+                   "result": math.fsum(results[name])}
+            for name in amounts
+        }
@@ -0,0 +1,190 @@
+"""
+Parallel reconciliation of transaction exports against the Task 2 strategies.
+
+A transaction file is a plain CSV with one charge per line:
+
+    strategy,percentage,amount,charged
+    credit_card,2.5,100.00,102.50
+    crypto,5.0,40.00,38.00
+
+Each row is re-priced in integer cents with the named strategy from
+``task2_payment.strategies`` (constructed with ``percentage``) and compared
+with the amount actually charged. Rows that cannot be priced, including rows
+without exactly four fields or with bytes that are not valid UTF-8, are
+counted as errors under their first field rather than aborting the run. Blank
+lines are skipped. The file is split into byte ranges that worker processes
+read line by line. Only the per-strategy totals travel back, so memory stays
+bounded however large the file is.
+
+Usage:
+    python -m src.reconcile transactions.csv [--workers N]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from src.task2_payment import strategies
+
+MAX_MISMATCH_SAMPLES = 10
+
+# Rows that cannot be priced: unknown strategy (KeyError), unparsable numbers
+# (ValueError/OverflowError), strategies that cannot be built from a single
+# percentage (TypeError) or have no fixed-point mode (NotImplementedError)
+_ROW_ERRORS = (KeyError, ValueError, OverflowError, TypeError, NotImplementedError)
+
+
+def _empty_totals() -> dict:
+    return {"rows": 0, "amount": 0, "expected": 0, "charged": 0,
+            "mismatches": 0, "mismatch_offsets": [], "errors": 0, "error_offsets": []}
+
+
+def _to_cents(text: str) -> int:
+    """Parse a decimal amount such as "102.50" to integer cents."""
+    return round(float(text) * 100)
+
+
+def _reconcile_range(path: str, start: int, end: int, tolerance_cents: int) -> dict:
+    """
+    Worker: reconcile every line that starts inside [start, end).
+
+    Returns per-strategy totals with the money fields in integer cents, so
+    chunks merge exactly.
+    """
+    totals: dict[str, dict] = {}
+    # (name, percentage) -> strategy, or None if it cannot be built
+    instances: dict[tuple[str, str], object] = {}
+    with open(path, "rb") as f:
+        position = 0
+        if start:
+            # Skip to the first line that starts at or after `start`; a line
+            # straddling the boundary belongs to the previous range
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            offset, position = position, position + len(line)
+            # Undecodable bytes become U+FFFD, so the row fails to price and
+            # is counted below instead of aborting the whole range
+            text = line.decode(errors="replace").strip()
+            if not text:
+                continue
+            fields = text.split(",")
+            name = fields[0]
+            if name == "strategy":
+                continue
+            stats = totals.get(name)
+            if stats is None:
+                stats = totals[name] = _empty_totals()
+            strategy = None
+            if len(fields) == 4:
+                _, percentage, amount_text, charged_text = fields
+                key = (name, percentage)
+                if key not in instances:
+                    try:
+                        instances[key] = strategies.create(name, float(percentage))
+                    except _ROW_ERRORS:
+                        instances[key] = None
+                strategy = instances[key]
+            expected = None
+            if strategy is not None:
+                try:
+                    amount, charged = _to_cents(amount_text), _to_cents(charged_text)
+                    expected = strategy.process_payment_cents(amount)
+                except _ROW_ERRORS:
+                    pass
+            if expected is None:
+                stats["errors"] += 1
+                if len(stats["error_offsets"]) < MAX_MISMATCH_SAMPLES:
+                    stats["error_offsets"].append(offset)
+                continue
+
+            stats["rows"] += 1
+            stats["amount"] += amount
+            stats["expected"] += expected
+            stats["charged"] += charged
+            if abs(expected - charged) > tolerance_cents:
+                stats["mismatches"] += 1
+                if len(stats["mismatch_offsets"]) < MAX_MISMATCH_SAMPLES:
+                    stats["mismatch_offsets"].append(offset)
+    return totals
+
+
+def reconcile(path, workers: Optional[int] = None, chunk_size: int = 64 * 1024 * 1024,
+              tolerance_cents: int = 0) -> dict[str, dict]:
+    """
+    Reconcile a transaction file, in parallel for large inputs.
+
+    Each row is re-priced exactly with the strategy's process_payment_cents(),
+    so expected and charged amounts are compared in whole cents.
+
+    Args:
+        path: CSV file of strategy,percentage,amount,charged rows
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Bytes per work unit
+        tolerance_cents: Largest difference in cents between the expected and
+            the charged amount still counted as a match
+
+    Returns:
+        {strategy: {"rows", "amount", "expected", "charged", "mismatches",
+                    "mismatch_offsets", "errors", "error_offsets"}} where the
+        money fields are totals in major units over the rows that could be
+        priced, errors counts rows that could not (unknown strategy, bad
+        numbers or encoding, not exactly four fields, or a strategy that
+        cannot be built from one percentage), and
+        the offset lists hold byte offsets of up to MAX_MISMATCH_SAMPLES rows
+        per work unit
+    """
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+    ranges = [(path, start, min(start + chunk_size, size), tolerance_cents)
+              for start in range(0, size, chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(ranges) <= 1:
+        parts = [_reconcile_range(*args) for args in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_reconcile_range, *zip(*ranges)))
+
+    merged: dict[str, dict] = {}
+    for part in parts:
+        for name, stats in part.items():
+            target = merged.setdefault(name, _empty_totals())
+            for key in ("rows", "amount", "expected", "charged", "mismatches", "errors"):
+                target[key] += stats[key]
+            target["mismatch_offsets"].extend(stats["mismatch_offsets"])
+            target["error_offsets"].extend(stats["error_offsets"])
+    for stats in merged.values():
+        for key in ("amount", "expected", "charged"):
+            stats[key] /= 100
+        stats["mismatch_offsets"].sort()
+        stats["error_offsets"].sort()
+    return merged
+
+
+def main():
+    """Reconcile the file given on the command line and print a summary."""
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) != 1:
+        print("Usage: python -m src.reconcile <transactions.csv> [--workers N]")
+        sys.exit(1)
+
+    results = reconcile(args[0], workers=workers)
+    print(f"{'strategy':<14}{'rows':>10}{'charged':>16}{'expected':>16}"
+          f"{'mismatches':>12}{'errors':>10}")
+    for name, stats in sorted(results.items()):
+        print(f"{name:<14}{stats['rows']:>10,}{stats['charged']:>16,.2f}"
+              f"{stats['expected']:>16,.2f}{stats['mismatches']:>12,}{stats['errors']:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Binary shape store for the Task 1 shape hierarchy.
+
+Shapes are written as fixed-width records (a type tag followed by three
+float64 dimensions) grouped by type, behind a small header that indexes each
+type's section. Reading maps the file with ``mmap``: aggregates such as total
+area are computed directly from the mapped buffer, and Shape objects are only
+built when a record is indexed.
+
+File layout (little-endian):
+    header   : magic b"SHP1", version (u16), section count (u16)
+    sections : per type -> tag (u8, 7 pad bytes), record offset (u64), count (u64)
+    records  : tag (u8, 7 pad bytes), dim0, dim1, dim2 (float64 each)
+"""
+
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable
+
+from src.task1_shapes import (
+    Circle, Rectangle, Shape, Square, Triangle, base_shape_class, triangle_areas,
+)
+
+MAGIC = b"SHP1"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<B7xQQ")
+_RECORD = struct.Struct("<B7xddd")
+_DOUBLES_PER_RECORD = _RECORD.size // 8
+
+# Tag -> (kind name, class, record -> constructor args). Order is file order.
+_KINDS = {
+    1: ("circle", Circle, lambda s: (s.radius, 0.0, 0.0)),
+    2: ("rectangle", Rectangle, lambda s: (s.width, s.height, 0.0)),
+    3: ("square", Square, lambda s: (s.side, 0.0, 0.0)),
+    4: ("triangle", Triangle, lambda s: (s.side_a, s.side_b, s.side_c)),
+}
+_TAG_BY_CLASS = {cls: tag for tag, (_, cls, _) in _KINDS.items()}
+_ARITY = {1: 1, 2: 2, 3: 1, 4: 3}
+
+
+def write_shapes(path, shapes: Iterable[Shape]) -> int:
+    """
+    Write shapes to a binary store file.
+
+    Args:
+        path: Destination file path
+        shapes: Circles, Rectangles, Squares and Triangles to store
+
+    Returns:
+        The number of shapes written
+
+    Raises:
+        TypeError: If a shape is not one of the four concrete kinds or a subclass
+    """
+    groups: dict[int, list[bytes]] = {tag: [] for tag in _KINDS}
+    for shape in shapes:
+        tag = _TAG_BY_CLASS.get(base_shape_class(type(shape)))
+        if tag is None:
+            raise TypeError(f"Cannot store shape of type {type(shape).__name__}")
+        groups[tag].append(_RECORD.pack(tag, *_KINDS[tag][2](shape)))
+
+    offset = _HEADER.size + _SECTION.size * len(groups)
+    offset += -offset % 8  # keep records float64-aligned
+    header = [_HEADER.pack(MAGIC, VERSION, len(groups))]
+    for tag, records in groups.items():
+        header.append(_SECTION.pack(tag, offset, len(records)))
+        offset += len(records) * _RECORD.size
+
+    with open(path, "wb") as f:
+        head = b"".join(header)
+        f.write(head)
+        f.write(b"\0" * (-len(head) % 8))
+        for records in groups.values():
+            f.writelines(records)
+    return sum(len(records) for records in groups.values())
+
+
+class ShapeStore:
+    """
+    Read-only, memory-mapped view of a file written by write_shapes.
+
+    Indexing (``store[i]``) builds a single Shape on demand; records are
+    ordered by type (circles, rectangles, squares, triangles). Use as a
+    context manager, or call close() when done.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} shape store")
+        # tag -> (byte offset, record count)
+        self._sections: dict[int, tuple[int, int]] = {}
+        for i in range(count):
+            tag, offset, n = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            self._sections[tag] = (offset, n)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "ShapeStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(n for _, n in self._sections.values())
+
+    def count(self, kind: str) -> int:
+        """Number of stored shapes of one kind (e.g. "circle")."""
+        return self._sections.get(self._tag(kind), (0, 0))[1]
+
+    def __getitem__(self, index: int) -> Shape:
+        if index < 0:
+            index += len(self)
+        for tag, (offset, n) in self._sections.items():
+            if 0 <= index < n:
+                _, *dims = _RECORD.unpack_from(self._mm, offset + index * _RECORD.size)
+                return _KINDS[tag][1](*dims[:_ARITY[tag]])
+            index -= n
+        raise IndexError("shape index out of range")
+
+    def area_by_kind(self) -> dict[str, float]:
+        """Sum areas per kind straight from the mapped records."""
+        totals = {}
+        for tag, (name, _, _) in _KINDS.items():
+            with self._columns(tag) as (d0, d1, d2):
+                if tag == 1:
+                    total = math.pi * math.fsum(r * r for r in d0)
+                elif tag == 2:
+                    total = math.fsum(w * h for w, h in zip(d0, d1))
+                elif tag == 3:
+                    total = math.fsum(s * s for s in d0)
+                else:
+                    total = math.fsum(triangle_areas(d0, d1, d2))
+            totals[name] = total
+        return totals
+
+    def perimeter_by_kind(self) -> dict[str, float]:
+        """Sum perimeters per kind straight from the mapped records."""
+        totals = {}
+        for tag, (name, _, _) in _KINDS.items():
+            with self._columns(tag) as (d0, d1, d2):
+                if tag == 1:
+                    total = 2 * math.pi * math.fsum(d0)
+                elif tag == 2:
+                    total = 2 * (math.fsum(d0) + math.fsum(d1))
+                elif tag == 3:
+                    total = 4 * math.fsum(d0)
+                else:
+                    total = math.fsum(d0) + math.fsum(d1) + math.fsum(d2)
+            totals[name] = total
+        return totals
+
+    def total_area(self) -> float:
+        return math.fsum(self.area_by_kind().values())
+
+    def total_perimeter(self) -> float:
+        return math.fsum(self.perimeter_by_kind().values())
+
+    def _tag(self, kind: str) -> int:
+        for tag, (name, _, _) in _KINDS.items():
+            if name == kind:
+                return tag
+        raise ValueError(f"Unknown shape kind: {kind!r}")
+
+    def _columns(self, tag: int) -> "_Columns":
+        offset, n = self._sections.get(tag, (0, 0))
+        return _Columns(self._mm, offset, n)
+
+
+class _Columns:
+    """Zero-copy strided float64 views of one section's three dimension columns."""
+
+    def __init__(self, mm: mmap.mmap, offset: int, count: int):
+        self._views = [memoryview(mm)[offset:offset + count * _RECORD.size]]
+
+    def __enter__(self):
+        doubles = self._views[0].cast("d")
+        self._views.append(doubles)
+        step = _DOUBLES_PER_RECORD
+        columns = [doubles[i::step] for i in (1, 2, 3)]
+        self._views.extend(columns)
+        return columns
+
+    def __exit__(self, *exc) -> None:
+        # Release views innermost-first so the mmap can be closed afterwards.
+        for view in reversed(self._views):
+            view.release()
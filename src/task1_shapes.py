@@ -3,11 +3,24 @@ Lab 4 Task 1: Shape Hierarchy
 Implement the Shape abstract base class and concrete shapes.
 """
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import add, mul
+from typing import Callable, Iterable, Optional
 import math
+import os
+import weakref
 
 class Shape(ABC):
     """Abstract base class for shapes."""
-    
+
+    # Concrete shapes declare their dimensions as slots so instances carry no
+    # per-object __dict__; see scripts/bench_shapes.py for the memory figures.
+    __slots__ = ()
+
     @abstractmethod
     def area(self) -> float:
         """Calculate area."""
@@ -20,25 +33,692 @@ class Shape(ABC):
 
 class Circle(Shape):
     """Circle shape."""
-    # YOUR CODE HERE
-    pass
+
+    __slots__ = ("radius",)
+
+    def __init__(self, radius: float):
+        self.radius = radius
+
+    def area(self) -> float:
+        return math.pi * self.radius * self.radius
+
+    def perimeter(self) -> float:
+        return 2 * math.pi * self.radius
 
 class Rectangle(Shape):
     """Rectangle shape."""
-    # YOUR CODE HERE
-    pass
+
+    __slots__ = ("width", "height")
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+
+    def area(self) -> float:
+        return self.width * self.height
+
+    def perimeter(self) -> float:
+        return 2 * (self.width + self.height)
 
 class Square(Rectangle):
     """Square - special case of Rectangle."""
-    # YOUR CODE HERE
-    pass
+
+    __slots__ = ()
+
+    def __init__(self, side: float):
+        super().__init__(side, side)
+
+    @property
+    def side(self) -> float:
+        return self.width
 
 class Triangle(Shape):
     """Triangle with three sides."""
-    # YOUR CODE HERE
-    pass
+
+    __slots__ = ("side_a", "side_b", "side_c")
+
+    def __init__(self, side_a: float, side_b: float, side_c: float):
+        if (side_a + side_b <= side_c or side_a + side_c <= side_b
+                or side_b + side_c <= side_a):
+            raise ValueError(
+                f"Sides {side_a}, {side_b}, {side_c} violate the triangle inequality"
+            )
+        self.side_a = side_a
+        self.side_b = side_b
+        self.side_c = side_c
+
+    def area(self) -> float:
+        """Calculate area with Heron's formula (numerically stable form)."""
+        return _stable_heron(self.side_a, self.side_b, self.side_c)
+
+    def perimeter(self) -> float:
+        return self.side_a + self.side_b + self.side_c
+
+
+_BUILTIN_SHAPES = frozenset((Circle, Rectangle, Square, Triangle))
+
+
+def base_shape_class(cls: type) -> Optional[type]:
+    """Nearest built-in shape class in ``cls``'s MRO, or None for other shapes."""
+    for base in cls.__mro__:
+        if base in _BUILTIN_SHAPES:
+            return base
+    return None
+
+
+def _stable_heron(a: float, b: float, c: float) -> float:
+    """Heron's formula in Kahan's ordering (a >= b >= c), accurate for needle triangles."""
+    if a < b:
+        a, b = b, a
+    if b < c:
+        b, c = c, b
+        if a < b:
+            a, b = b, a
+    if c - (a - b) <= 0:
+        return math.nan
+    return 0.25 * math.sqrt((a + (b + c)) * (c - (a - b)) * (c + (a - b)) * (a + (b - c)))
+
+
+def triangle_mask(side_a, side_b, side_c) -> list[bool]:
+    """
+    Check the triangle inequality for many triangles in one pass.
+
+    Args:
+        side_a, side_b, side_c: Equal-length sequences of side lengths
+
+    Returns:
+        A list with True for every row that forms a non-degenerate triangle
+    """
+    return [a + b > c and a + c > b and b + c > a
+            for a, b, c in zip(side_a, side_b, side_c)]
+
+
+def triangle_areas(side_a, side_b, side_c) -> array:
+    """
+    Areas of many triangles, NaN where the sides do not form a triangle.
+
+    Uses the numerically stable form of Heron's formula, which keeps full
+    precision for needle-like triangles where the textbook form cancels.
+    """
+    # _stable_heron inlined: a per-row function call would dominate the cost
+    sqrt, nan = math.sqrt, math.nan
+    areas = []
+    append = areas.append
+    for a, b, c in zip(side_a, side_b, side_c):
+        if a < b:
+            a, b = b, a
+        if b < c:
+            b, c = c, b
+            if a < b:
+                a, b = b, a
+        d = c - (a - b)
+        append(0.25 * sqrt((a + (b + c)) * d * (c + (a - b)) * (a + (b - c))) if d > 0 else nan)
+    return array("d", areas)
+
+
+class CacheStats:
+    """Hit/miss counters for the cached shape classes."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"CacheStats(hits={self.hits}, misses={self.misses})"
+
+
+class _CachedMeasurements:
+    """
+    Mixin that memoizes area() and perimeter().
+
+    Any ordinary attribute assignment (i.e. a dimension change) clears both
+    cached values. Each cached class gets its own ``cache_stats``.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.cache_stats = CacheStats()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_area", None)
+        object.__setattr__(self, "_perimeter", None)
+
+    def area(self) -> float:
+        if self._area is None:
+            self.cache_stats.misses += 1
+            object.__setattr__(self, "_area", super().area())
+        else:
+            self.cache_stats.hits += 1
+        return self._area
+
+    def perimeter(self) -> float:
+        if self._perimeter is None:
+            self.cache_stats.misses += 1
+            object.__setattr__(self, "_perimeter", super().perimeter())
+        else:
+            self.cache_stats.hits += 1
+        return self._perimeter
+
+
+class CachedCircle(_CachedMeasurements, Circle):
+    """Circle with memoized area/perimeter."""
+
+    __slots__ = ("_area", "_perimeter")
+
+
+class CachedRectangle(_CachedMeasurements, Rectangle):
+    """Rectangle with memoized area/perimeter."""
+
+    __slots__ = ("_area", "_perimeter")
+
+
+class CachedSquare(_CachedMeasurements, Square):
+    """Square with memoized area/perimeter."""
+
+    __slots__ = ("_area", "_perimeter")
+
+
+class CachedTriangle(_CachedMeasurements, Triangle):
+    """Triangle with memoized area/perimeter."""
+
+    __slots__ = ("_area", "_perimeter")
+
+
+class _Frozen:
+    """Mixin that makes each attribute write-once, so shared instances stay immutable."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        # Deleting would let the next __setattr__ write a new value
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class _InternedCircle(_Frozen, Circle):
+    __slots__ = ("__weakref__",)
+
+
+class _InternedRectangle(_Frozen, Rectangle):
+    __slots__ = ("__weakref__",)
+
+
+class _InternedSquare(_Frozen, Square):
+    __slots__ = ("__weakref__",)
+
+
+class _InternedTriangle(_Frozen, Triangle):
+    __slots__ = ("__weakref__",)
+
+
+class ShapeInterner:
+    """
+    Flyweight factory returning one shared, immutable shape per set of dimensions.
+
+    Every live interned shape is tracked in a weak-value dictionary, so shapes
+    nobody references are dropped automatically. The ``maxsize`` most recently
+    requested shapes are also held strongly, keeping common sizes alive
+    between uses without letting the cache grow without bound.
+
+    Example:
+        interner = ShapeInterner()
+        interner.get(Square, 5.0) is interner.get(Square, 5.0)  # True
+    """
+
+    _FROZEN = {
+        Circle: _InternedCircle,
+        Rectangle: _InternedRectangle,
+        Square: _InternedSquare,
+        Triangle: _InternedTriangle,
+    }
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._live: "weakref.WeakValueDictionary[tuple, Shape]" = weakref.WeakValueDictionary()
+        self._recent: OrderedDict[tuple, Shape] = OrderedDict()
+
+    def get(self, cls: type, *dims: float) -> Shape:
+        """Return the shared ``cls(*dims)`` instance, creating it on first use."""
+        key = (cls, dims)
+        shape = self._live.get(key)
+        if shape is None:
+            try:
+                frozen = self._FROZEN[cls]
+            except KeyError:
+                raise TypeError(f"Cannot intern shapes of type {cls.__name__}") from None
+            self.stats.misses += 1
+            shape = frozen(*dims)
+            self._live[key] = shape
+        else:
+            self.stats.hits += 1
+        self._recent[key] = shape
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+        return shape
+
+    def clear(self) -> None:
+        self._recent.clear()
+        self._live.clear()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+
+_default_interner = ShapeInterner()
+
+
+def intern_shape(cls: type, *dims: float) -> Shape:
+    """Shared immutable instance of ``cls(*dims)`` from the module-level interner."""
+    return _default_interner.get(cls, *dims)
 
 def total_area(shapes: list[Shape]) -> float:
     """Calculate total area of all shapes (polymorphism demo)."""
-    # YOUR CODE HERE
-    pass
+    return sum(shape.area() for shape in shapes)
+
+
+def stream_total_area(
+    shapes: Iterable[Shape],
+    chunk_size: int = 4096,
+    on_progress: Optional[Callable[[int, float], None]] = None,
+) -> float:
+    """
+    Sum areas of any iterable of shapes in constant memory.
+
+    Shapes are consumed ``chunk_size`` at a time; each chunk is reduced with
+    ``math.fsum`` and folded, together with the rounding error of that sum,
+    into a compensated running total. After every
+    chunk ``on_progress(shapes_seen, partial_total)`` is called if given.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(shapes)
+    total = _CompensatedSum()
+    seen = 0
+    while True:
+        chunk = [shape.area() for shape in islice(iterator, chunk_size)]
+        if not chunk:
+            break
+        seen += len(chunk)
+        chunk_total = math.fsum(chunk)
+        chunk.append(-chunk_total)
+        total.add(chunk_total)
+        total.add(math.fsum(chunk))
+        if on_progress is not None:
+            on_progress(seen, total.value)
+    return total.value
+
+
+class ShapeBatch:
+    """
+    Columnar (struct-of-arrays) store for large shape collections.
+
+    Each concrete kind keeps its dimensions in flat ``array('d')`` columns so
+    areas and perimeters are computed per kind in a few C-level passes instead
+    of one virtual ``area()`` call per object. Subclasses of the built-in
+    kinds (cached or interned shapes) are stored by their dimensions; shapes
+    of any other ``Shape`` subclass are kept as objects and measured
+    polymorphically.
+    """
+
+    KINDS = ("circle", "rectangle", "square", "triangle")
+
+    def __init__(self):
+        self.radii = array("d")
+        self.widths = array("d")
+        self.heights = array("d")
+        self.sides = array("d")
+        self.sides_a = array("d")
+        self.sides_b = array("d")
+        self.sides_c = array("d")
+        self.others: list[Shape] = []
+
+    @classmethod
+    def from_shapes(cls, shapes) -> "ShapeBatch":
+        """Build a batch from an iterable of Shape objects."""
+        batch = cls()
+        batch.extend(shapes)
+        return batch
+
+    def add(self, shape: Shape) -> None:
+        """Append one shape to the column of its kind."""
+        kind = type(shape)
+        if kind not in _BUILTIN_SHAPES:
+            kind = base_shape_class(kind)
+        if kind is Circle:
+            self.radii.append(shape.radius)
+        elif kind is Square:
+            self.sides.append(shape.side)
+        elif kind is Rectangle:
+            self.widths.append(shape.width)
+            self.heights.append(shape.height)
+        elif kind is Triangle:
+            self.sides_a.append(shape.side_a)
+            self.sides_b.append(shape.side_b)
+            self.sides_c.append(shape.side_c)
+        else:
+            self.others.append(shape)
+
+    def extend(self, shapes) -> None:
+        """Append every shape from an iterable."""
+        for shape in shapes:
+            self.add(shape)
+
+    def to_shapes(self) -> list[Shape]:
+        """
+        Rebuild Shape objects, grouped by kind in KINDS order, others last.
+
+        The batch keeps no record of insertion order across kinds, so this is
+        not an order-preserving round trip of from_shapes(); cached and
+        interned shapes also come back as their plain base classes.
+        """
+        shapes: list[Shape] = [Circle(r) for r in self.radii]
+        shapes.extend(map(Rectangle, self.widths, self.heights))
+        shapes.extend(map(Square, self.sides))
+        shapes.extend(map(Triangle, self.sides_a, self.sides_b, self.sides_c))
+        shapes.extend(self.others)
+        return shapes
+
+    def __len__(self) -> int:
+        return (len(self.radii) + len(self.widths) + len(self.sides)
+                + len(self.sides_a) + len(self.others))
+
+    def areas(self, kind: str) -> array:
+        """Return the per-shape areas of one kind as a flat array."""
+        if kind == "circle":
+            return array("d", [math.pi * r * r for r in self.radii])
+        if kind == "rectangle":
+            return array("d", map(mul, self.widths, self.heights))
+        if kind == "square":
+            return array("d", map(mul, self.sides, self.sides))
+        if kind == "triangle":
+            return triangle_areas(self.sides_a, self.sides_b, self.sides_c)
+        raise ValueError(f"Unknown shape kind: {kind!r}")
+
+    def perimeters(self, kind: str) -> array:
+        """Return the per-shape perimeters of one kind as a flat array."""
+        if kind == "circle":
+            return array("d", [2 * math.pi * r for r in self.radii])
+        if kind == "rectangle":
+            return array("d", [2 * x for x in map(add, self.widths, self.heights)])
+        if kind == "square":
+            return array("d", [4 * s for s in self.sides])
+        if kind == "triangle":
+            return array("d", map(add, map(add, self.sides_a, self.sides_b),
+                                  self.sides_c))
+        raise ValueError(f"Unknown shape kind: {kind!r}")
+
+    def area_by_kind(self) -> dict[str, float]:
+        """Sum areas per kind; shapes outside KINDS are reported as "other"."""
+        totals = {
+            "circle": math.pi * math.fsum(map(mul, self.radii, self.radii)),
+            "rectangle": math.fsum(map(mul, self.widths, self.heights)),
+            "square": math.fsum(map(mul, self.sides, self.sides)),
+            "triangle": math.fsum(self.areas("triangle")),
+        }
+        totals["other"] = math.fsum(shape.area() for shape in self.others)
+        return totals
+
+    def perimeter_by_kind(self) -> dict[str, float]:
+        """Sum perimeters per kind; shapes outside KINDS are reported as "other"."""
+        totals = {
+            "circle": 2 * math.pi * math.fsum(self.radii),
+            "rectangle": 2 * (math.fsum(self.widths) + math.fsum(self.heights)),
+            "square": 4 * math.fsum(self.sides),
+            "triangle": math.fsum(self.sides_a) + math.fsum(self.sides_b)
+                        + math.fsum(self.sides_c),
+        }
+        totals["other"] = math.fsum(shape.perimeter() for shape in self.others)
+        return totals
+
+    def total_area(self) -> float:
+        """Grand total area of every shape in the batch."""
+        return math.fsum(self.area_by_kind().values())
+
+    def total_perimeter(self) -> float:
+        """Grand total perimeter of every shape in the batch."""
+        return math.fsum(self.perimeter_by_kind().values())
+
+    def shards(self, count: int) -> list["ShapeBatch"]:
+        """Split into at most ``count`` batches of roughly equal size."""
+        shards = [ShapeBatch() for _ in range(max(1, count))]
+        columns = ("radii", "widths", "heights", "sides",
+                   "sides_a", "sides_b", "sides_c", "others")
+        for name in columns:
+            column = getattr(self, name)
+            step = -(-len(column) // len(shards))
+            for i, shard in enumerate(shards):
+                setattr(shard, name, column[i * step:(i + 1) * step])
+        return [shard for shard in shards if len(shard)]
+
+
+class _CompensatedSum:
+    """Running sum with Neumaier compensation, so long add/remove runs don't drift."""
+
+    __slots__ = ("_sum", "_compensation")
+
+    def __init__(self):
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def add(self, value: float) -> None:
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+        self._sum = total
+
+    @property
+    def value(self) -> float:
+        return self._sum + self._compensation
+
+
+class ShapeCollection:
+    """
+    Shape container that keeps area and perimeter totals up to date.
+
+    Each shape is measured once when it is added, so add, remove and replace
+    are O(1) and the total/subtotal queries never rescan the collection.
+    Subtotals are keyed by the shape's class name.
+    """
+
+    def __init__(self, shapes=()):
+        # id(shape) -> (shape, area, perimeter) as measured on insertion
+        self._entries: dict[int, tuple[Shape, float, float]] = {}
+        self._area = _CompensatedSum()
+        self._perimeter = _CompensatedSum()
+        self._by_type: dict[str, tuple[_CompensatedSum, _CompensatedSum]] = {}
+        self._counts: dict[str, int] = {}
+        for shape in shapes:
+            self.add(shape)
+
+    def add(self, shape: Shape) -> None:
+        """Add a shape; adding the same object twice raises ValueError."""
+        key = id(shape)
+        if key in self._entries:
+            raise ValueError(f"{shape!r} is already in the collection")
+        area, perimeter = shape.area(), shape.perimeter()
+        self._entries[key] = (shape, area, perimeter)
+        self._apply(type(shape).__name__, area, perimeter, 1)
+
+    def remove(self, shape: Shape) -> None:
+        """Remove a shape; raises KeyError if it is not in the collection."""
+        try:
+            _, area, perimeter = self._entries.pop(id(shape))
+        except KeyError:
+            raise KeyError(shape) from None
+        self._apply(type(shape).__name__, -area, -perimeter, -1)
+
+    def replace(self, old: Shape, new: Shape) -> None:
+        """
+        Swap one shape for another, e.g. after resizing it.
+
+        ``new`` is validated and measured before ``old`` is removed, so a
+        failed replace leaves the collection unchanged.
+        """
+        if id(old) not in self._entries:
+            raise KeyError(old)
+        if new is not old and id(new) in self._entries:
+            raise ValueError(f"{new!r} is already in the collection")
+        area, perimeter = new.area(), new.perimeter()
+        self.remove(old)
+        self._entries[id(new)] = (new, area, perimeter)
+        self._apply(type(new).__name__, area, perimeter, 1)
+
+    def total_area(self) -> float:
+        return self._area.value
+
+    def total_perimeter(self) -> float:
+        return self._perimeter.value
+
+    def subtotals(self) -> dict[str, dict[str, float]]:
+        """Per-type count, area and perimeter for every type still present."""
+        return {
+            name: {"count": self._counts[name], "area": area.value,
+                   "perimeter": perimeter.value}
+            for name, (area, perimeter) in self._by_type.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return (shape for shape, _, _ in self._entries.values())
+
+    def __contains__(self, shape) -> bool:
+        return id(shape) in self._entries
+
+    def _apply(self, name: str, area: float, perimeter: float, count: int) -> None:
+        self._area.add(area)
+        self._perimeter.add(perimeter)
+        if name not in self._by_type:
+            self._by_type[name] = (_CompensatedSum(), _CompensatedSum())
+            self._counts[name] = 0
+        type_area, type_perimeter = self._by_type[name]
+        type_area.add(area)
+        type_perimeter.add(perimeter)
+        self._counts[name] += count
+        if self._counts[name] == 0:
+            del self._by_type[name], self._counts[name]
+
+
+class ShapeIndex:
+    """
+    Shapes ordered by area, then perimeter, for top-k and range queries.
+
+    Entries are kept in a sorted list of ``(area, perimeter, id)`` keys, so
+    lookups are binary searches and inserts/deletes never rebuild the index.
+    Like ShapeCollection, each shape is measured once when it is added.
+    """
+
+    def __init__(self, shapes=()):
+        self._keys: list[tuple[float, float, int]] = []
+        self._shapes: dict[int, Shape] = {}
+        self._key_of: dict[int, tuple[float, float, int]] = {}
+        for shape in shapes:
+            self.add(shape)
+
+    def add(self, shape: Shape) -> None:
+        """Insert a shape; adding the same object twice raises ValueError."""
+        ident = id(shape)
+        if ident in self._shapes:
+            raise ValueError(f"{shape!r} is already indexed")
+        key = (shape.area(), shape.perimeter(), ident)
+        insort(self._keys, key)
+        self._shapes[ident] = shape
+        self._key_of[ident] = key
+
+    def remove(self, shape: Shape) -> None:
+        """Delete a shape; raises KeyError if it is not indexed."""
+        key = self._key_of.pop(id(shape), None)
+        if key is None:
+            raise KeyError(shape)
+        del self._keys[bisect_left(self._keys, key)]
+        del self._shapes[key[2]]
+
+    def largest(self, k: int) -> list[Shape]:
+        """The k largest shapes, largest first."""
+        if k <= 0:
+            return []
+        return [self._shapes[key[2]] for key in reversed(self._keys[-k:])]
+
+    def smallest(self, k: int) -> list[Shape]:
+        """The k smallest shapes, smallest first."""
+        return [self._shapes[key[2]] for key in self._keys[:max(k, 0)]]
+
+    def area_range(self, low: float, high: float) -> list[Shape]:
+        """Shapes with ``low <= area <= high``, in ascending order."""
+        start = bisect_left(self._keys, (low,))
+        stop = bisect_right(self._keys, (high, math.inf))
+        return [self._shapes[key[2]] for key in self._keys[start:stop]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return (self._shapes[key[2]] for key in self._keys)
+
+    def __contains__(self, shape) -> bool:
+        return id(shape) in self._shapes
+
+
+def _shard_area(shard) -> tuple[float, float]:
+    """Worker: total area of one shard (a ShapeBatch or a list of shapes) plus its rounding error."""
+    if isinstance(shard, ShapeBatch):
+        areas = [a for kind in ShapeBatch.KINDS for a in shard.areas(kind)]
+        areas.extend(shape.area() for shape in shard.others)
+    else:
+        areas = [shape.area() for shape in shard]
+    total = math.fsum(areas)
+    areas.append(-total)
+    return total, math.fsum(areas)
+
+
+def parallel_total_area(shapes, workers: Optional[int] = None,
+                        threshold: int = 100_000) -> float:
+    """
+    Sum areas across a process pool.
+
+    A ShapeBatch is split into one columnar shard per worker; a list of shapes
+    is split into contiguous slices, so the parent never converts it. Each
+    shard is reduced locally, and the (total, error) pairs from every shard
+    are merged with ``math.fsum`` so the result does not depend on how the
+    input was sharded. Inputs smaller than ``threshold`` (or ``workers=1``)
+    are summed serially, since pool start-up would dominate.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(shapes, ShapeBatch):
+        if workers <= 1 or len(shapes) < threshold:
+            return math.fsum(_shard_area(shapes))
+        shards = shapes.shards(workers)
+    else:
+        if not isinstance(shapes, list):
+            shapes = list(shapes)
+        if workers <= 1 or len(shapes) < threshold:
+            return math.fsum(shape.area() for shape in shapes)
+        step = -(-len(shapes) // workers)
+        shards = [shapes[i:i + step] for i in range(0, len(shapes), step)]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        partials = list(pool.map(_shard_area, shards))
+    return math.fsum(value for pair in partials for value in pair)
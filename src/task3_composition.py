@@ -17,17 +17,59 @@ vehicles the features they need as objects. This is flexible and scales linearly
 Key Concept: A vehicle IS NOT a sum of its features; a vehicle HAS features.
 """
 
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
+from array import array
+from collections import Counter
+from functools import lru_cache
+from itertools import compress
+from typing import Iterable
 
 
-class Feature(ABC):
+class _FeatureMeta(ABCMeta):
+    """
+    Metaclass that hands out one shared instance of each stateless Feature.
+
+    A class is stateless when its instances can hold no data and construction
+    has no effect: every class in its MRO declares ``__slots__ = ()`` and none
+    overrides ``__init__``. Calling such a class with no arguments returns the
+    same instance every time, without running ``__init__`` again. Any other
+    class, or a call with arguments, builds a new object as usual.
+    """
+
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        cls._shareable = cls.__init__ is object.__init__ and all(
+            "__slots__" in vars(base) and not base.__slots__
+            for base in cls.__mro__[:-1]
+        )
+
+    def __call__(cls, *args, **kwargs):
+        if args or kwargs or not cls._shareable:
+            return super().__call__(*args, **kwargs)
+        # Look in this class's own namespace so subclasses get their own instance
+        instance = cls.__dict__.get("_shared_instance")
+        if instance is None:
+            instance = super().__call__()
+            cls._shared_instance = instance
+        return instance
+
+
+class Feature(ABC, metaclass=_FeatureMeta):
     """
     Abstract base class for vehicle features.
 
     Each feature represents a capability that a vehicle can have.
     Features are composed into vehicles rather than inherited.
+
+    Features without state are shared: calling ``Engine()`` with no
+    arguments always returns the same Engine object, so a large fleet does
+    not allocate one feature object per vehicle. Only features that provably
+    carry no state are shared (see _FeatureMeta): a subclass that defines
+    ``__init__`` or omits ``__slots__ = ()`` gets a new object per call.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def describe(self) -> str:
         """
@@ -36,7 +78,6 @@ class Feature(ABC):
         Returns:
             A string describing the feature's action
         """
-        # TODO: Subclasses must implement this
         pass
 
 
@@ -45,6 +86,8 @@ class Engine(Feature):
     Engine feature - allows vehicles to start and move.
     """
 
+    __slots__ = ()
+
     def describe(self) -> str:
         """
         Return a description of the engine's action.
@@ -52,8 +95,7 @@ class Engine(Feature):
         Returns:
             The string "Engine started"
         """
-        # TODO: Return the engine action
-        pass
+        return "Engine started"
 
 
 class Wheels(Feature):
@@ -61,6 +103,8 @@ class Wheels(Feature):
     Wheels feature - allows vehicles to roll on ground.
     """
 
+    __slots__ = ()
+
     def describe(self) -> str:
         """
         Return a description of the wheels' action.
@@ -68,8 +112,7 @@ class Wheels(Feature):
         Returns:
             The string "Wheels rolling"
         """
-        # TODO: Return the wheels action
-        pass
+        return "Wheels rolling"
 
 
 class Wings(Feature):
@@ -77,6 +120,8 @@ class Wings(Feature):
     Wings feature - allows vehicles to fly through the air.
     """
 
+    __slots__ = ()
+
     def describe(self) -> str:
         """
         Return a description of the wings' action.
@@ -84,8 +129,7 @@ class Wings(Feature):
         Returns:
             The string "Wings deployed"
         """
-        # TODO: Return the wings action
-        pass
+        return "Wings deployed"
 
 
 class Propeller(Feature):
@@ -93,6 +137,8 @@ class Propeller(Feature):
     Propeller feature - allows vehicles to move through water.
     """
 
+    __slots__ = ()
+
     def describe(self) -> str:
         """
         Return a description of the propeller's action.
@@ -100,8 +146,29 @@ class Propeller(Feature):
         Returns:
             The string "Propeller spinning"
         """
-        # TODO: Return the propeller action
-        pass
+        return "Propeller spinning"
+
+
+# Bounded so that vehicles built from many distinct (or short-lived,
+# dynamically created) feature classes cannot grow the caches forever.
+@lru_cache(maxsize=1024)
+def _type_set(kinds: frozenset) -> frozenset:
+    """Every Feature class in the MROs of a set of feature classes."""
+    return frozenset(
+        cls for kind in kinds for cls in kind.__mro__ if issubclass(cls, Feature)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _layout(kinds: tuple) -> tuple:
+    """
+    Type set and shared-instance tuple for an ordered combination of classes.
+
+    The tuple is None unless every class has a shared instance; vehicles whose
+    features are exactly those instances all reuse it.
+    """
+    shared = tuple(kind.__dict__.get("_shared_instance") for kind in kinds)
+    return _type_set(frozenset(kinds)), None if None in shared else shared
 
 
 class Vehicle:
@@ -112,12 +179,23 @@ class Vehicle:
     a Vehicle simply contains a list of features. This is much more flexible
     and allows for arbitrary combinations.
 
+    Features are stored as a tuple. When every feature is a shared stateless
+    instance, vehicles with the same combination also share the same tuple
+    and type set, so a vehicle costs little more than its own slots.
+
     Example:
         car = Vehicle([Engine(), Wheels()])
         boat = Vehicle([Engine(), Propeller()])
         plane = Vehicle([Engine(), Wings()])
+
+    Each vehicle also keeps a frozen set of every Feature class in the MRO of
+    its features, rebuilt whenever the features change, so has_feature() is
+    a constant-time set lookup instead of an isinstance() scan. Indexes that
+    need to follow those changes can register a callback with watch().
     """
 
+    __slots__ = ("name", "_features", "_feature_types", "_watchers")
+
     def __init__(self, name: str, features: list):
         """
         Initialize a vehicle with a name and list of features.
@@ -126,8 +204,45 @@ class Vehicle:
             name: The name of the vehicle (e.g., "Car", "Boat", "Plane")
             features: A list of Feature objects this vehicle has
         """
-        # TODO: Store the name and features
-        pass
+        self.name = name
+        # Replaced by a list on the first watch() call
+        self._watchers = ()
+        self.features = features
+
+    @property
+    def features(self) -> tuple:
+        """The vehicle's features, in order (read-only; see add/remove_feature)."""
+        return self._features
+
+    @features.setter
+    def features(self, features) -> None:
+        self._features = tuple(features)
+        self._reindex()
+
+    def add_feature(self, feature: Feature) -> None:
+        """
+        Give the vehicle another feature.
+
+        Args:
+            feature: The Feature object to add
+        """
+        self._features += (feature,)
+        self._reindex()
+
+    def remove_feature(self, feature: Feature) -> None:
+        """
+        Take a feature away from the vehicle.
+
+        Args:
+            feature: The Feature object to remove
+
+        Raises:
+            ValueError: If the vehicle does not have that feature
+        """
+        features = list(self._features)
+        features.remove(feature)
+        self._features = tuple(features)
+        self._reindex()
 
     def describe(self) -> list:
         """
@@ -136,18 +251,301 @@ class Vehicle:
         Returns:
             A list of strings, one for each feature's description
         """
-        # TODO: Return a list of descriptions from each feature
-        pass
+        return [feature.describe() for feature in self._features]
 
     def has_feature(self, feature_type: type) -> bool:
         """
         Check if this vehicle has a particular feature type.
 
+        Abstract parents count too: a vehicle with an Engine also has
+        Feature.
+
         Args:
             feature_type: A Feature class to check for (e.g., Engine, Wheels)
 
         Returns:
             True if the vehicle has a feature of that type, False otherwise
         """
-        # TODO: Check if any feature is an instance of feature_type
-        pass
+        return feature_type in self._feature_types
+
+    def watch(self, callback) -> None:
+        """
+        Call ``callback(vehicle, old_types, new_types)`` whenever features change.
+
+        Args:
+            callback: Receives the vehicle and its feature-type sets before
+                and after the change
+        """
+        if not self._watchers:
+            self._watchers = []
+        self._watchers.append(callback)
+
+    def unwatch(self, callback) -> None:
+        """
+        Stop calling a callback registered with watch().
+
+        Raises:
+            ValueError: If the callback is not registered
+        """
+        if callback not in self._watchers:
+            raise ValueError("callback is not watching this vehicle")
+        self._watchers.remove(callback)
+
+    def _reindex(self) -> None:
+        old_types = getattr(self, "_feature_types", frozenset())
+        self._feature_types, shared = _layout(tuple(map(type, self._features)))
+        if shared is not None and shared == self._features:
+            self._features = shared
+        for callback in self._watchers:
+            callback(self, old_types, self._feature_types)
+
+
+class Fleet:
+    """
+    Columnar container for large numbers of vehicles.
+
+    Every Feature class seen in the fleet (including abstract parents) is
+    given one bit, and each vehicle is stored as a packed 64-bit mask of its
+    feature types. A query such as "Engine and Wings but no Wheels" is tested
+    with bit operations once per distinct mask; the fleet is then filtered by
+    set membership in C-level passes (map/compress) instead of several
+    has_feature() calls per vehicle.
+
+    If a vehicle's features change after it was added, call refresh().
+
+    Example:
+        fleet = Fleet(vehicles)
+        fleet.query(all_of=[Engine, Wings], none_of=[Wheels])
+    """
+
+    MAX_FEATURE_TYPES = 64
+
+    def __init__(self, vehicles: Iterable[Vehicle] = ()):
+        """
+        Initialize the fleet.
+
+        Args:
+            vehicles: Vehicles to add
+        """
+        self._bits: dict[type, int] = {}
+        self._vehicles: list[Vehicle] = []
+        self._masks = array("Q")
+        self._positions: dict[int, int] = {}
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def add(self, vehicle: Vehicle) -> None:
+        """
+        Add a vehicle to the fleet.
+
+        Raises:
+            ValueError: If the vehicle is already in the fleet
+        """
+        if id(vehicle) in self._positions:
+            raise ValueError(f"{vehicle.name} is already in the fleet")
+        mask = self._mask_of(vehicle)
+        self._positions[id(vehicle)] = len(self._vehicles)
+        self._vehicles.append(vehicle)
+        self._masks.append(mask)
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """
+        Remove a vehicle in O(1) by moving the last vehicle into its slot.
+
+        Raises:
+            KeyError: If the vehicle is not in the fleet
+        """
+        index = self._positions.pop(id(vehicle))
+        last_vehicle, last_mask = self._vehicles.pop(), self._masks.pop()
+        if last_vehicle is not vehicle:
+            self._vehicles[index] = last_vehicle
+            self._masks[index] = last_mask
+            self._positions[id(last_vehicle)] = index
+
+    def refresh(self, vehicle: Vehicle) -> None:
+        """Recompute a vehicle's mask after its features changed."""
+        self._masks[self._positions[id(vehicle)]] = self._mask_of(vehicle)
+
+    def query(self, all_of: Iterable[type] = (), any_of: Iterable[type] = (),
+              none_of: Iterable[type] = ()) -> list[Vehicle]:
+        """
+        Vehicles matching a feature combination.
+
+        Args:
+            all_of: Feature types every match must have
+            any_of: Feature types of which a match must have at least one
+                (ignored if empty)
+            none_of: Feature types no match may have
+
+        Returns:
+            The matching vehicles
+        """
+        matching = self._matching(all_of, any_of, none_of)
+        return list(compress(self._vehicles, map(matching.__contains__, self._masks)))
+
+    def count(self, all_of: Iterable[type] = (), any_of: Iterable[type] = (),
+              none_of: Iterable[type] = ()) -> int:
+        """Number of vehicles matching a feature combination (see query)."""
+        matching = self._matching(all_of, any_of, none_of)
+        return sum(map(matching.__contains__, self._masks))
+
+    def combination_counts(self) -> dict[frozenset, int]:
+        """
+        How many vehicles have each exact combination of feature types.
+
+        Returns:
+            {frozenset of Feature classes: vehicle count}
+        """
+        classes = {bit: cls for cls, bit in self._bits.items()}
+        result = {}
+        for mask, n in Counter(self._masks).items():
+            result[frozenset(cls for bit, cls in classes.items() if mask >> bit & 1)] = n
+        return result
+
+    def __len__(self) -> int:
+        return len(self._vehicles)
+
+    def __iter__(self):
+        return iter(self._vehicles)
+
+    def __contains__(self, vehicle) -> bool:
+        return id(vehicle) in self._positions
+
+    def _mask_of(self, vehicle: Vehicle) -> int:
+        """A vehicle's mask; new types get bits only if they all fit."""
+        bits = self._bits
+        unseen = [t for t in vehicle._feature_types if t not in bits]
+        if len(bits) + len(unseen) > self.MAX_FEATURE_TYPES:
+            raise ValueError(
+                f"A Fleet supports at most {self.MAX_FEATURE_TYPES} feature types"
+            )
+        for feature_type in unseen:
+            bits[feature_type] = len(bits)
+        mask = 0
+        for feature_type in vehicle._feature_types:
+            mask |= 1 << bits[feature_type]
+        return mask
+
+    def _query_mask(self, feature_types: Iterable[type]):
+        """Mask for known types, or None if any type has never been seen."""
+        mask = 0
+        for feature_type in feature_types:
+            bit = self._bits.get(feature_type)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def _matching(self, all_of, any_of, none_of) -> set:
+        """The distinct vehicle masks that satisfy a query."""
+        required = self._query_mask(all_of)
+        if required is None:
+            return set()
+        wanted = 0
+        for feature_type in any_of:
+            bit = self._bits.get(feature_type)
+            if bit is not None:
+                wanted |= 1 << bit
+        if any_of and not wanted:
+            return set()
+        excluded = 0
+        for feature_type in none_of:
+            bit = self._bits.get(feature_type)
+            if bit is not None:
+                excluded |= 1 << bit
+        return {
+            mask for mask in set(self._masks)
+            if mask & required == required and not mask & excluded
+            and (not wanted or mask & wanted)
+        }
+
+
+class FeatureIndex:
+    """
+    Inverted index from Feature class to the vehicles that have it.
+
+    Posting sets cover subclass relationships: a vehicle with a JetEngine is
+    listed under JetEngine, Engine and Feature. The index watches every
+    vehicle it holds, so add_feature()/remove_feature() on a vehicle update
+    only the affected postings.
+
+    Example:
+        index = FeatureIndex(vehicles)
+        index.with_all(Engine, Wings)
+    """
+
+    def __init__(self, vehicles: Iterable[Vehicle] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            vehicles: Vehicles to index
+        """
+        self._postings: dict[type, set] = {}
+        self._vehicles: set = set()
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def add(self, vehicle: Vehicle) -> None:
+        """
+        Index a vehicle and start following its feature changes.
+
+        Raises:
+            ValueError: If the vehicle is already indexed
+        """
+        if vehicle in self._vehicles:
+            raise ValueError(f"{vehicle.name} is already indexed")
+        self._vehicles.add(vehicle)
+        self._update(vehicle, frozenset(), vehicle._feature_types)
+        vehicle.watch(self._update)
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """
+        Drop a vehicle from the index.
+
+        Raises:
+            KeyError: If the vehicle is not indexed
+        """
+        self._vehicles.remove(vehicle)
+        vehicle.unwatch(self._update)
+        self._update(vehicle, vehicle._feature_types, frozenset())
+
+    def with_feature(self, feature_type: type) -> frozenset:
+        """All indexed vehicles that have a feature of this type."""
+        return frozenset(self._postings.get(feature_type, ()))
+
+    def with_all(self, *feature_types: type) -> set:
+        """
+        Vehicles having every one of the given feature types.
+
+        Intersects posting sets smallest first, so the cost is bounded by the
+        rarest feature rather than the size of the fleet.
+        """
+        if not feature_types:
+            return set(self._vehicles)
+        postings = sorted((self._postings.get(t, set()) for t in feature_types), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def counts(self) -> dict[type, int]:
+        """Number of vehicles per feature type."""
+        return {feature_type: len(posting) for feature_type, posting in self._postings.items()}
+
+    def __len__(self) -> int:
+        return len(self._vehicles)
+
+    def __contains__(self, vehicle) -> bool:
+        return vehicle in self._vehicles
+
+    def _update(self, vehicle: Vehicle, old_types: frozenset, new_types: frozenset) -> None:
+        for feature_type in old_types - new_types:
+            posting = self._postings[feature_type]
+            posting.discard(vehicle)
+            if not posting:
+                del self._postings[feature_type]
+        for feature_type in new_types - old_types:
+            self._postings.setdefault(feature_type, set()).add(vehicle)
@@ -41,6 +41,294 @@ class TestShapes:
         s = Square(5)
         assert s.perimeter() == 20
 
+    def test_triangle_heron_area(self):
+        from src.task1_shapes import Triangle
+        t = Triangle(3, 4, 5)
+        assert abs(t.area() - 6.0) < 0.01
+        assert t.perimeter() == 12
+
+    def test_triangle_rejects_invalid_sides(self):
+        from src.task1_shapes import Triangle
+        with pytest.raises(ValueError):
+            Triangle(1, 2, 3)
+
+    def test_shapes_have_no_instance_dict(self):
+        from src.task1_shapes import Circle, Rectangle, Square, Triangle
+        for shape in (Circle(1), Rectangle(1, 2), Square(3), Triangle(3, 4, 5)):
+            assert not hasattr(shape, "__dict__")
+
+
+class TestTriangleBatch:
+    def test_mask_flags_invalid_rows(self):
+        from src.task1_shapes import triangle_mask
+        assert triangle_mask([3, 1, 2], [4, 2, 2], [5, 3, 3]) == [True, False, True]
+
+    def test_areas_match_triangle_class(self):
+        from src.task1_shapes import Triangle, triangle_areas
+        areas = triangle_areas([3, 7.5, 5], [4, 6.1, 5], [5, 4.2, 5])
+        for area, sides in zip(areas, [(3, 4, 5), (7.5, 6.1, 4.2), (5, 5, 5)]):
+            assert abs(area - Triangle(*sides).area()) < 1e-9
+        assert math.isnan(triangle_areas([1], [2], [4])[0])
+
+    def test_degenerate_rows_agree_with_mask(self):
+        from src.task1_shapes import triangle_areas, triangle_mask
+        sides = ([1, 2, 3], [2, 2, 4], [3, 4, 5])
+        areas = triangle_areas(*sides)
+        assert [not math.isnan(a) for a in areas] == triangle_mask(*sides)
+
+    def test_all_triangle_paths_agree(self, tmp_path):
+        from src.task1_shapes import ShapeBatch, Triangle, triangle_areas
+        from src.shape_store import ShapeStore, write_shapes
+        t = Triangle(1.0, 1.0 + 1e-9, 3e-9)
+        batch = ShapeBatch.from_shapes([t])
+        path = tmp_path / "needle.bin"
+        write_shapes(path, [t])
+        with ShapeStore(path) as store:
+            assert (t.area() == triangle_areas([1.0], [1.0 + 1e-9], [3e-9])[0]
+                    == batch.area_by_kind()["triangle"] == store.area_by_kind()["triangle"])
+
+    def test_needle_triangle_is_accurate(self):
+        from src.task1_shapes import triangle_areas
+        # Isosceles needle: base 1e-8, legs 1e8 -> area = 0.5 * base * height
+        a, c = 1e8, 1e-8
+        expected = 0.5 * c * math.sqrt(a * a - (c / 2) ** 2)
+        assert abs(triangle_areas([a], [a], [c])[0] - expected) / expected < 1e-12
+
+
+class TestCachedShapes:
+    def test_cache_hits_and_invalidation(self):
+        from src.task1_shapes import CachedCircle, Circle
+        CachedCircle.cache_stats.reset()
+        c = CachedCircle(2)
+        assert isinstance(c, Circle)
+        assert c.area() == Circle(2).area()
+        c.area()
+        assert (CachedCircle.cache_stats.hits, CachedCircle.cache_stats.misses) == (1, 1)
+        c.radius = 3
+        assert c.area() == Circle(3).area()
+        assert CachedCircle.cache_stats.misses == 2
+
+    def test_cached_square_and_triangle(self):
+        from src.task1_shapes import CachedSquare, CachedTriangle, Rectangle, total_area
+        s = CachedSquare(4)
+        t = CachedTriangle(3, 4, 5)
+        assert isinstance(s, Rectangle)
+        assert s.perimeter() == 16 and s.perimeter() == 16
+        assert CachedSquare.cache_stats.hits >= 1
+        s.width = s.height = 5
+        assert s.area() == 25
+        assert abs(total_area([s, t]) - 31) < 1e-9
+
+    def test_batch_and_store_accept_cached_shapes(self, tmp_path):
+        from src.task1_shapes import CachedCircle, CachedSquare, CachedTriangle, ShapeBatch
+        from src.shape_store import ShapeStore, write_shapes
+        shapes = [CachedCircle(1), CachedSquare(2), CachedTriangle(3, 4, 5)]
+        batch = ShapeBatch.from_shapes(shapes)
+        assert not batch.others
+        assert (len(batch.radii), len(batch.sides), len(batch.sides_a)) == (1, 1, 1)
+        path = tmp_path / "cached.bin"
+        assert write_shapes(path, shapes) == 3
+        with ShapeStore(path) as store:
+            assert store.count("square") == 1 and store.count("rectangle") == 0
+            assert abs(store.total_area() - (math.pi + 4 + 6)) < 1e-9
+
+
+class TestShapeInterner:
+    def test_identical_dimensions_share_one_instance(self):
+        from src.task1_shapes import Rectangle, Square, ShapeInterner, total_area
+        interner = ShapeInterner()
+        shapes = [interner.get(Square, 5.0) for _ in range(100)]
+        assert all(s is shapes[0] for s in shapes)
+        assert isinstance(shapes[0], Square) and isinstance(shapes[0], Rectangle)
+        assert total_area(shapes) == 2500
+        assert interner.stats.misses == 1 and interner.stats.hits == 99
+
+    def test_interned_shapes_are_immutable(self):
+        from src.task1_shapes import Circle, intern_shape
+        c = intern_shape(Circle, 3.0)
+        with pytest.raises(AttributeError):
+            c.radius = 4.0
+        with pytest.raises(AttributeError):
+            del c.radius
+        assert intern_shape(Circle, 3.0).radius == 3.0
+        assert c.area() == Circle(3.0).area()
+
+    def test_cache_is_bounded_and_weak(self):
+        from src.task1_shapes import Circle, ShapeInterner
+        interner = ShapeInterner(maxsize=2)
+        for r in range(10):
+            interner.get(Circle, float(r))
+        assert len(interner) == 2
+
+    def test_batch_and_store_accept_interned_shapes(self, tmp_path):
+        from src.task1_shapes import Rectangle, Square, ShapeBatch, intern_shape
+        from src.shape_store import ShapeStore, write_shapes
+        shapes = [intern_shape(Square, 3.0), intern_shape(Rectangle, 2.0, 5.0)]
+        batch = ShapeBatch.from_shapes(shapes)
+        assert not batch.others
+        assert batch.area_by_kind()["square"] == 9
+        path = tmp_path / "interned.bin"
+        assert write_shapes(path, shapes) == 2
+        with ShapeStore(path) as store:
+            assert store.count("square") == 1 and store.count("rectangle") == 1
+            assert store.total_area() == 19
+
+
+class TestStreamTotalArea:
+    def test_streams_generator_with_progress(self):
+        from src.task1_shapes import Square, stream_total_area
+        progress = []
+        shapes = (Square(1) for _ in range(10))
+        total = stream_total_area(shapes, chunk_size=4,
+                                  on_progress=lambda n, t: progress.append((n, t)))
+        assert total == 10.0
+        assert progress == [(4, 4.0), (8, 8.0), (10, 10.0)]
+
+    def test_precision_beats_naive_sum(self):
+        from src.task1_shapes import Rectangle, stream_total_area
+        shapes = [Rectangle(1e16, 1), Rectangle(1, 1), Rectangle(-1e16, 1)]
+        assert stream_total_area(iter(shapes), chunk_size=2) == 1.0
+
+    def test_empty_input(self):
+        from src.task1_shapes import stream_total_area
+        assert stream_total_area([]) == 0.0
+
+
+class TestShapeBatch:
+    def _shapes(self):
+        from src.task1_shapes import Circle, Rectangle, Square, Triangle
+        return [Circle(1), Rectangle(2, 3), Square(4), Triangle(3, 4, 5), Circle(2.5)]
+
+    def test_batch_matches_polymorphic_total(self):
+        from src.task1_shapes import ShapeBatch, total_area
+        shapes = self._shapes()
+        batch = ShapeBatch.from_shapes(shapes)
+        assert len(batch) == len(shapes)
+        assert abs(batch.total_area() - total_area(shapes)) < 1e-9
+        expected_perimeter = sum(s.perimeter() for s in shapes)
+        assert abs(batch.total_perimeter() - expected_perimeter) < 1e-9
+
+    def test_batch_area_by_kind(self):
+        from src.task1_shapes import ShapeBatch
+        totals = ShapeBatch.from_shapes(self._shapes()).area_by_kind()
+        assert abs(totals["circle"] - math.pi * (1 + 6.25)) < 1e-9
+        assert totals["rectangle"] == 6
+        assert totals["square"] == 16
+        assert abs(totals["triangle"] - 6.0) < 1e-9
+
+    def test_to_shapes_groups_by_kind(self):
+        from src.task1_shapes import ShapeBatch, total_area
+        shapes = self._shapes()
+        rebuilt = ShapeBatch.from_shapes(shapes).to_shapes()
+        assert sorted(type(s).__name__ for s in rebuilt) == sorted(
+            type(s).__name__ for s in shapes)
+        assert abs(total_area(rebuilt) - total_area(shapes)) < 1e-9
+
+    def test_parallel_total_area_matches_serial(self):
+        from src.task1_shapes import parallel_total_area, total_area
+        shapes = self._shapes() * 50
+        expected = total_area(shapes)
+        assert abs(parallel_total_area(shapes) - expected) < 1e-9
+        assert abs(parallel_total_area(shapes, workers=2, threshold=0) - expected) < 1e-9
+
+    def test_shards_cover_every_shape(self):
+        from src.task1_shapes import ShapeBatch
+        batch = ShapeBatch.from_shapes(self._shapes() * 3)
+        shards = batch.shards(4)
+        assert sum(len(shard) for shard in shards) == len(batch)
+        assert abs(sum(s.total_area() for s in shards) - batch.total_area()) < 1e-9
+
+
+class TestShapeIndex:
+    def test_top_k_and_range(self):
+        from src.task1_shapes import Circle, Rectangle, Square, ShapeIndex
+        big, mid, tall, small = Square(10), Square(3), Rectangle(1, 9), Circle(0.5)
+        index = ShapeIndex([mid, small, big, tall])
+        assert index.largest(2) == [big, tall]
+        assert index.smallest(1) == [small]
+        # Equal areas are ordered by perimeter
+        assert index.area_range(9, 9) == [mid, tall]
+        assert index.area_range(1, 50) == [mid, tall]
+
+    def test_incremental_updates(self):
+        from src.task1_shapes import Square, ShapeIndex
+        a, b = Square(1), Square(2)
+        index = ShapeIndex([a])
+        index.add(b)
+        assert index.largest(5) == [b, a]
+        index.remove(b)
+        assert list(index) == [a] and b not in index
+        with pytest.raises(KeyError):
+            index.remove(b)
+
+
+class TestShapeStore:
+    def test_round_trip_and_aggregates(self, tmp_path):
+        from src.task1_shapes import Circle, Rectangle, Square, Triangle, total_area
+        from src.shape_store import ShapeStore, write_shapes
+        shapes = [Circle(1), Rectangle(2, 3), Square(4), Triangle(3, 4, 5), Circle(2)]
+        path = tmp_path / "shapes.bin"
+        assert write_shapes(path, shapes) == 5
+        with ShapeStore(path) as store:
+            assert len(store) == 5
+            assert store.count("circle") == 2
+            assert abs(store.total_area() - total_area(shapes)) < 1e-9
+            assert abs(store.total_perimeter() - sum(s.perimeter() for s in shapes)) < 1e-9
+            last = store[-1]
+            assert isinstance(last, Triangle) and last.area() == 6.0
+            assert isinstance(store[3], Square)
+
+    def test_rejects_foreign_files(self, tmp_path):
+        from src.shape_store import ShapeStore
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not a shape store")
+        with pytest.raises(ValueError):
+            ShapeStore(path)
+
+
+class TestShapeCollection:
+    def test_running_totals_follow_add_and_remove(self):
+        from src.task1_shapes import Circle, Rectangle, Square, ShapeCollection
+        c, r, s = Circle(1), Rectangle(2, 3), Square(4)
+        shapes = ShapeCollection([c, r])
+        shapes.add(s)
+        assert len(shapes) == 3
+        assert abs(shapes.total_area() - (math.pi + 6 + 16)) < 1e-9
+        shapes.remove(r)
+        assert r not in shapes
+        assert abs(shapes.total_area() - (math.pi + 16)) < 1e-9
+        assert abs(shapes.total_perimeter() - (2 * math.pi + 16)) < 1e-9
+        assert set(shapes.subtotals()) == {"Circle", "Square"}
+
+    def test_replace_and_no_drift(self):
+        from src.task1_shapes import Rectangle, Square, ShapeCollection
+        base = Square(1)
+        shapes = ShapeCollection([base])
+        for i in range(10_000):
+            tmp = Rectangle(0.1 * i, 1e8)
+            shapes.add(tmp)
+            shapes.remove(tmp)
+        assert shapes.total_area() == 1.0
+        bigger = Square(2)
+        shapes.replace(base, bigger)
+        assert shapes.subtotals()["Square"] == {"count": 1, "area": 4.0, "perimeter": 8.0}
+
+    def test_remove_missing_raises(self):
+        from src.task1_shapes import Circle, ShapeCollection
+        with pytest.raises(KeyError):
+            ShapeCollection().remove(Circle(1))
+
+    def test_failed_replace_leaves_collection_unchanged(self):
+        from src.task1_shapes import Circle, Square, ShapeCollection
+        a, b = Circle(1), Square(2)
+        shapes = ShapeCollection([a, b])
+        with pytest.raises(ValueError):
+            shapes.replace(a, b)
+        with pytest.raises(AttributeError):
+            shapes.replace(a, object())
+        assert a in shapes and len(shapes) == 2
+        assert abs(shapes.total_area() - (math.pi + 4)) < 1e-9
+
 
 class TestPaymentStrategy:
     def test_payment_strategy_abc_enforcement(self):
@@ -97,6 +385,582 @@ class TestPaymentStrategy:
             pytest.skip("task2_payment not yet implemented")
 
 
+class TestBatchCheckout:
+    def test_checkout_many_matches_scalar(self, payment_amounts, payment_fees):
+        from src.task2_payment import (PaymentProcessor, CreditCardPayment,
+                                       PayPalPayment, CryptoPayment)
+        strategies = [CreditCardPayment(payment_fees["credit_card"]),
+                      PayPalPayment(payment_fees["paypal"]),
+                      CryptoPayment(payment_fees["crypto_discount"])]
+        for strategy in strategies:
+            processor = PaymentProcessor(strategy)
+            expected = [processor.checkout(a) for a in payment_amounts]
+            assert processor.checkout_many(payment_amounts) == expected
+
+    def test_unknown_strategy_falls_back_to_scalar_loop(self):
+        from src.task2_payment import PaymentProcessor, PaymentStrategy
+
+        class FlatFee(PaymentStrategy):
+            def process_payment(self, amount):
+                return amount + 1.0
+
+        processor = PaymentProcessor(FlatFee())
+        assert processor.checkout_many((1.0, 2.0)) == [2.0, 3.0]
+        assert processor.checkout_many([]) == []
+
+
+class TestFixedPointPayments:
+    def test_cents_match_expected_totals(self, payment_amounts, payment_fees, expected_payments):
+        from src.task2_payment import (PaymentProcessor, CreditCardPayment,
+                                       PayPalPayment, CryptoPayment)
+        cents = [round(a * 100) for a in payment_amounts]
+        cases = [(CreditCardPayment(payment_fees["credit_card"]), "credit_card"),
+                 (PayPalPayment(payment_fees["paypal"]), "paypal"),
+                 (CryptoPayment(payment_fees["crypto_discount"]), "crypto")]
+        for strategy, key in cases:
+            results = PaymentProcessor(strategy).checkout_many_cents(cents)
+            assert all(isinstance(r, int) for r in results)
+            for result, expected in zip(results, expected_payments[key]):
+                assert abs(result - expected * 100) <= 1
+
+    def test_bankers_rounding_of_fee(self):
+        from src.task2_payment import CreditCardPayment, CryptoPayment
+        one_percent = CreditCardPayment(1.0)
+        assert one_percent.process_payment_cents(50) == 50    # fee 0.5 -> 0
+        assert one_percent.process_payment_cents(150) == 152  # fee 1.5 -> 2
+        assert one_percent.process_payment_cents(250) == 252  # fee 2.5 -> 2
+        assert CryptoPayment(5.0).process_payment_cents(10_000) == 9_500
+        amounts = list(range(-500, 500))
+        for strategy in (one_percent, CryptoPayment(2.5)):
+            assert strategy.process_payments_cents(amounts) == [
+                strategy.process_payment_cents(a) for a in amounts]
+
+    def test_sub_basis_point_rates_and_rate_changes(self):
+        from src.task2_payment import CreditCardPayment
+        card = CreditCardPayment(0.125)
+        assert card.process_payment(10_000.0) == 10_012.5
+        with pytest.raises(ValueError):
+            card.process_payment_cents(1_000_000)
+        card.fee_percentage = 0.13
+        assert card.fee_basis_points == 13
+        assert card.process_payment_cents(1_000_000) == 1_001_300
+
+    def test_strategy_without_fixed_point_mode(self):
+        from src.task2_payment import PaymentProcessor, PaymentStrategy
+
+        class FlatFee(PaymentStrategy):
+            def process_payment(self, amount):
+                return amount + 1.0
+
+        with pytest.raises(NotImplementedError):
+            PaymentProcessor(FlatFee()).checkout_cents(100)
+
+
+class TestTieredFeePayment:
+    TIERS = [(1000, 2.0), (0, 3.0), (10000, 1.0)]
+
+    def test_flat_mode_uses_bracket_rate(self):
+        from src.task2_payment import TieredFeePayment
+        tiered = TieredFeePayment(self.TIERS, mode="flat")
+        assert tiered.process_payment(100.0) == 103.0
+        assert tiered.process_payment(1000.0) == 1020.0
+        assert tiered.process_payment(20000.0) == 20200.0
+
+    def test_marginal_mode_charges_each_slice(self):
+        from src.task2_payment import TieredFeePayment
+        tiered = TieredFeePayment(self.TIERS)
+        assert tiered.process_payment(500.0) == 515.0
+        # 1000 at 3% + 9000 at 2% + 10000 at 1%
+        assert abs(tiered.process_payment(20000.0) - (20000 + 30 + 180 + 100)) < 1e-9
+
+    def test_batch_matches_scalar(self):
+        from src.task2_payment import TieredFeePayment
+        amounts = [-5.0, 0.0, 999.99, 1000.0, 5000.0, 10000.0, 123456.78]
+        for mode in TieredFeePayment.MODES:
+            tiered = TieredFeePayment(self.TIERS, mode=mode)
+            assert tiered.process_payments(amounts) == [tiered.process_payment(a) for a in amounts]
+            assert tiered.process_payment(-5.0) == -5.0
+
+    def test_invalid_tables(self):
+        from src.task2_payment import TieredFeePayment
+        with pytest.raises(ValueError):
+            TieredFeePayment([(100, 2.0)])
+        with pytest.raises(ValueError):
+            TieredFeePayment([(0, 2.0)], mode="progressive")
+
+
+class TestCompositeStrategy:
+    def test_linear_chain_is_fused(self):
+        from src.task2_payment import CompositeStrategy, CreditCardPayment, CryptoPayment
+        chain = CompositeStrategy(CreditCardPayment(2.5), CryptoPayment(5.0))
+        assert abs(chain.multiplier() - 1.025 * 0.95) < 1e-12
+        stepwise = CryptoPayment(5.0).process_payment(CreditCardPayment(2.5).process_payment(100.0))
+        assert abs(chain.process_payment(100.0) - stepwise) < 1e-9
+        assert chain.process_payments([100.0, 200.0]) == [
+            chain.process_payment(100.0), chain.process_payment(200.0)]
+
+    def test_non_linear_stage_runs_in_order(self):
+        from src.task2_payment import (CompositeStrategy, CreditCardPayment,
+                                       PayPalPayment, PaymentStrategy)
+
+        class FlatFee(PaymentStrategy):
+            def process_payment(self, amount):
+                return amount + 1.0
+
+        chain = CompositeStrategy(CreditCardPayment(10.0), FlatFee(), PayPalPayment(10.0))
+        assert chain.multiplier() is None
+        assert abs(chain.process_payment(100.0) - 122.1) < 1e-9
+        assert abs(chain.process_payments([100.0])[0] - 122.1) < 1e-9
+
+    def test_nested_composites_fuse(self):
+        from src.task2_payment import CompositeStrategy, CreditCardPayment, PaymentProcessor
+        inner = CompositeStrategy(CreditCardPayment(1.0), CreditCardPayment(1.0))
+        outer = CompositeStrategy(inner, CreditCardPayment(1.0))
+        assert abs(outer.multiplier() - 1.01 ** 3) < 1e-12
+        assert PaymentProcessor(outer).checkout_cents(10_000) == 10_303
+
+    def test_integer_multiplier_is_a_factor(self):
+        from src.task2_payment import CompositeStrategy, PaymentStrategy
+
+        class Doubling(PaymentStrategy):
+            def process_payment(self, amount):
+                return amount * 2
+
+            def multiplier(self):
+                return 2
+
+        chain = CompositeStrategy(Doubling())
+        assert chain.multiplier() == 2.0
+        assert chain.process_payment(10.0) == 20.0
+        assert chain.process_payments([1.0, 2.0]) == [2.0, 4.0]
+
+
+class TestConcurrentStrategySwaps:
+    def test_checkouts_never_see_a_torn_strategy(self):
+        import threading
+        from src.task2_payment import PaymentProcessor, CreditCardPayment, PayPalPayment
+
+        card, paypal = CreditCardPayment(2.5), PayPalPayment(3.0)
+        processor = PaymentProcessor(card)
+        allowed = {card.process_payment(100.0), paypal.process_payment(100.0)}
+        allowed_cents = {card.process_payment_cents(10_000), paypal.process_payment_cents(10_000)}
+        stop = threading.Event()
+        bad = []
+
+        def swapper():
+            while not stop.is_set():
+                processor.set_strategy(paypal)
+                processor.set_strategy(card)
+
+        def worker():
+            for _ in range(2_000):
+                if processor.checkout(100.0) not in allowed:
+                    bad.append("float")
+                if processor.checkout_cents(10_000) not in allowed_cents:
+                    bad.append("cents")
+                batch = processor.checkout_many([100.0] * 4)
+                if len(set(batch)) != 1:
+                    bad.append("batch")
+
+        swap_thread = threading.Thread(target=swapper)
+        workers = [threading.Thread(target=worker) for _ in range(8)]
+        swap_thread.start()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        stop.set()
+        swap_thread.join()
+        assert bad == []
+
+    def test_swap_strategy_returns_previous(self):
+        from src.task2_payment import PaymentProcessor, CreditCardPayment, CryptoPayment
+        card = CreditCardPayment(2.5)
+        processor = PaymentProcessor(card)
+        assert processor.swap_strategy(CryptoPayment(5.0)) is card
+        with pytest.raises(TypeError):
+            processor.set_strategy("paypal")
+        with pytest.raises(TypeError):
+            PaymentProcessor("paypal")
+
+
+class TestIdempotentCheckout:
+    def _counting_strategy(self, delay=0.0):
+        import time
+        from src.task2_payment import PaymentStrategy
+
+        class Counting(PaymentStrategy):
+            calls = 0
+
+            def process_payment(self, amount):
+                type(self).calls += 1
+                time.sleep(delay)
+                return amount * 2
+
+        return Counting()
+
+    def test_retry_returns_cached_result(self):
+        from src.task2_payment import IdempotencyCache, PaymentProcessor
+        strategy = self._counting_strategy()
+        processor = PaymentProcessor(strategy, idempotency=IdempotencyCache())
+        assert processor.checkout(10.0, idempotency_key="order-1") == 20.0
+        assert processor.checkout(10.0, idempotency_key="order-1") == 20.0
+        assert processor.checkout(10.0) == 20.0
+        assert type(strategy).calls == 2
+
+    def test_lru_and_ttl_eviction(self):
+        from src.task2_payment import IdempotencyCache
+        now = [0.0]
+        cache = IdempotencyCache(maxsize=2, ttl=10.0, clock=lambda: now[0])
+        for key in "abc":
+            cache.get_or_compute(key, lambda: 1.0)
+        assert len(cache) == 2
+        assert cache.get_or_compute("a", lambda: 2.0) == 2.0  # "a" was evicted
+        now[0] = 11.0
+        assert cache.get_or_compute("c", lambda: 3.0) == 3.0  # "c" expired
+
+    def test_concurrent_duplicates_coalesce(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from src.task2_payment import IdempotencyCache, PaymentProcessor
+        strategy = self._counting_strategy(delay=0.05)
+        processor = PaymentProcessor(strategy, idempotency=IdempotencyCache())
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(
+                lambda _: processor.checkout(5.0, idempotency_key="dup"), range(8)))
+        assert results == [10.0] * 8
+        assert type(strategy).calls == 1
+
+    def test_key_without_cache_is_an_error(self):
+        from src.task2_payment import PaymentProcessor, CreditCardPayment
+        with pytest.raises(ValueError):
+            PaymentProcessor(CreditCardPayment(2.5)).checkout(1.0, idempotency_key="k")
+
+
+class TestTransactionLedger:
+    def test_checkouts_are_recorded_and_replayed(self, tmp_path):
+        from src.task2_payment import PaymentProcessor, CreditCardPayment, CryptoPayment
+        from src.payment_ledger import LedgerReader, TransactionLedger
+        path = tmp_path / "ledger.bin"
+        with TransactionLedger(path, batch_size=3) as ledger:
+            processor = PaymentProcessor(CreditCardPayment(2.5), ledger=ledger)
+            processor.checkout(100.0)
+            processor.checkout_many([10.0, 20.0])
+            processor.set_strategy(CryptoPayment(5.0))
+            processor.checkout(100.0)
+        with LedgerReader(path) as reader:
+            assert len(reader) == 4
+            records = list(reader)
+            assert records[0].strategy == "CreditCardPayment" and records[0].result == 102.5
+            assert reader.totals() == (230.0, 102.5 + 10.25 + 20.5 + 95.0)
+            by_strategy = reader.totals_by_strategy()
+            assert by_strategy["CryptoPayment"] == {"count": 1, "amount": 100.0, "result": 95.0}
+
+    def test_cents_checkouts_are_recorded(self, tmp_path):
+        from src.task2_payment import PaymentProcessor, CreditCardPayment
+        from src.payment_ledger import LedgerReader, TransactionLedger
+        path = tmp_path / "ledger.bin"
+        with TransactionLedger(path) as ledger:
+            processor = PaymentProcessor(CreditCardPayment(2.5), ledger=ledger)
+            assert processor.checkout_cents(10_000) == 10_250
+            assert processor.checkout_many_cents(iter([1_000, 2_000])) == [1_025, 2_050]
+        with LedgerReader(path) as reader:
+            assert [(r.amount, r.result) for r in reader] == [
+                (100.0, 102.5), (10.0, 10.25), (20.0, 20.5)]
+            assert round(reader.totals()[1] * 100) == 10_250 + 1_025 + 2_050
+
+    def test_sync_interval_commits_without_new_records(self, tmp_path):
+        import time
+        from src.payment_ledger import LedgerReader, TransactionLedger
+        path = tmp_path / "ledger.bin"
+        with TransactionLedger(path, batch_size=1000, sync_interval=0.02,
+                               fsync=False) as ledger:
+            ledger.record("A", 1.0, 1.0)
+            deadline = time.monotonic() + 2.0
+            while time.monotonic() < deadline:
+                with LedgerReader(path) as reader:
+                    if len(reader):
+                        break
+                time.sleep(0.01)
+            with LedgerReader(path) as reader:
+                assert len(reader) == 1
+        assert not ledger._flusher.is_alive()
+
+    def test_group_commit_and_partial_record(self, tmp_path):
+        from src.payment_ledger import LedgerReader, TransactionLedger
+        path = tmp_path / "ledger.bin"
+        ledger = TransactionLedger(path, batch_size=2, sync_interval=None, fsync=False)
+        ledger.record("A", 1.0, 1.0)
+        with LedgerReader(path) as reader:
+            assert len(reader) == 0  # still buffered
+        ledger.record("A", 2.0, 2.0)
+        with LedgerReader(path) as reader:
+            assert len(reader) == 2
+        ledger.close()
+        with open(path, "ab") as f:
+            f.write(b"\x01" * 10)  # torn trailing write
+        with LedgerReader(path) as reader:
+            assert len(reader) == 2
+            assert reader.totals() == (3.0, 3.0)
+        with TransactionLedger(path, sync_interval=None, fsync=False) as ledger:
+            ledger.record("B", 4.0, 4.0)
+        with LedgerReader(path) as reader:
+            assert [r.strategy for r in reader] == ["A", "A", "B"]
+            assert reader.totals() == (7.0, 7.0)
+
+    def test_rejects_other_files(self, tmp_path):
+        from src.payment_ledger import TransactionLedger
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"hello, world")
+        with pytest.raises(ValueError):
+            TransactionLedger(path)
+        assert path.read_bytes() == b"hello, world"
+
+    def test_strategy_names_are_never_lost_or_merged(self, tmp_path):
+        from src.payment_ledger import LedgerReader, TransactionLedger
+        path = tmp_path / "ledger.bin"
+        long_a, long_b = "Regional" * 3 + "CardPaymentA", "Regional" * 3 + "CardPaymentB"
+        with TransactionLedger(path, sync_interval=None) as ledger:
+            ledger.record("Café", 1.0, 1.0)
+            ledger.record_many(long_a, [1.0], [1.0])
+            ledger.record(long_b, 2.0, 2.0)
+        with LedgerReader(path) as reader:
+            names = [r.strategy for r in reader]
+            assert names[0] == "Caf?"
+            assert len(set(names)) == 3 and all(len(n) <= 24 for n in names)
+            assert len(reader.totals_by_strategy()) == 3
+
+
+class TestPaymentMetrics:
+    def test_counts_amounts_and_latency_per_strategy(self):
+        from src.task2_payment import (PaymentMetrics, PaymentProcessor,
+                                       CreditCardPayment, PayPalPayment)
+        metrics = PaymentMetrics()
+        processor = PaymentProcessor(CreditCardPayment(2.5), metrics=metrics)
+        processor.checkout(100.0)
+        processor.checkout_many([10.0, 20.0])
+        processor.set_strategy(PayPalPayment(3.0))
+        processor.checkout(50.0)
+        snapshot = metrics.snapshot()
+        assert snapshot["CreditCardPayment"]["count"] == 3
+        assert snapshot["CreditCardPayment"]["amount"] == 130.0
+        assert sum(snapshot["CreditCardPayment"]["buckets"].values()) == 3
+        assert snapshot["PayPalPayment"]["count"] == 1
+
+    def test_cents_checkouts_are_observed_in_major_units(self):
+        from src.task2_payment import PaymentMetrics, PaymentProcessor, CreditCardPayment
+        metrics = PaymentMetrics()
+        processor = PaymentProcessor(CreditCardPayment(2.5), metrics=metrics)
+        processor.checkout_cents(10_000)
+        processor.checkout_many_cents([1_000, 2_050])
+        stats = metrics.snapshot()["CreditCardPayment"]
+        assert stats["count"] == 3
+        assert stats["amount"] == 130.5
+        assert sum(stats["buckets"].values()) == 3
+
+    def test_bucket_bounds_are_contiguous(self):
+        from src.task2_payment import PaymentMetrics
+        for latency in list(range(200)) + [10**6, 10**9 + 7]:
+            index = PaymentMetrics.bucket_index(latency)
+            assert latency <= PaymentMetrics.bucket_upper_bound(index)
+            if index:
+                assert latency > PaymentMetrics.bucket_upper_bound(index - 1)
+
+    def test_prometheus_export(self):
+        from src.task2_payment import PaymentMetrics
+        metrics = PaymentMetrics()
+        metrics.observe("CryptoPayment", 100.0, 1_500)
+        text = metrics.to_prometheus()
+        assert 'payment_checkouts_total{strategy="CryptoPayment"} 1' in text
+        assert 'payment_checkout_latency_seconds_bucket{strategy="CryptoPayment",le="+Inf"} 1' in text
+        assert "# TYPE payment_checkout_latency_seconds histogram" in text
+
+
+class TestReconcile:
+    def _write(self, path, rows):
+        lines = ["strategy,percentage,amount,charged"] + [",".join(map(str, r)) for r in rows]
+        path.write_text("\n".join(lines) + "\n")
+
+    def test_totals_and_mismatches_per_strategy(self, tmp_path):
+        from src.reconcile import reconcile
+        path = tmp_path / "tx.csv"
+        rows = [("credit_card", 2.5, 100.0, 102.5), ("crypto", 5.0, 40.0, 38.0),
+                ("credit_card", 2.5, 200.0, 206.0)] * 50
+        self._write(path, rows)
+        result = reconcile(path, workers=1)
+        assert result["credit_card"]["rows"] == 100
+        assert result["credit_card"]["mismatches"] == 50
+        assert abs(result["credit_card"]["charged"] - 50 * (102.5 + 206.0)) < 1e-6
+        assert result["crypto"]["mismatches"] == 0
+        assert abs(result["crypto"]["expected"] - 50 * 38.0) < 1e-6
+
+    def test_small_chunks_and_processes_match_serial(self, tmp_path):
+        from src.reconcile import reconcile
+        path = tmp_path / "tx.csv"
+        rows = [("paypal", 3.0, float(i), round(i * 1.03, 2)) for i in range(500)]
+        self._write(path, rows)
+        serial = reconcile(path, workers=1)
+        chunked = reconcile(path, workers=2, chunk_size=97)
+        assert chunked["paypal"]["rows"] == serial["paypal"]["rows"] == 500
+        assert chunked["paypal"]["mismatches"] == serial["paypal"]["mismatches"]
+        assert abs(chunked["paypal"]["charged"] - serial["paypal"]["charged"]) < 1e-9
+
+    def test_unpriceable_rows_are_counted_not_fatal(self, tmp_path):
+        from src.reconcile import reconcile
+        path = tmp_path / "tx.csv"
+        rows = [("credit_card", 2.5, 100.0, 102.5), ("no_such_strategy", 1.0, 10.0, 10.1),
+                ("tiered", 2.0, 50.0, 51.0), ("paypal", "abc", 10.0, 10.3),
+                ("paypal", 3.0, "n/a", 10.3), ("paypal", 3.0, 10.0, 10.3)]
+        self._write(path, rows)
+        result = reconcile(path, workers=1)
+        assert result["credit_card"] == {
+            "rows": 1, "amount": 100.0, "expected": 102.5, "charged": 102.5,
+            "mismatches": 0, "mismatch_offsets": [], "errors": 0, "error_offsets": []}
+        assert result["no_such_strategy"]["errors"] == 1
+        assert result["tiered"]["errors"] == 1 and result["tiered"]["rows"] == 0
+        assert result["paypal"]["errors"] == 2 and result["paypal"]["rows"] == 1
+        assert len(result["paypal"]["error_offsets"]) == 2
+
+    def test_malformed_lines_are_counted_not_fatal(self, tmp_path):
+        from src.reconcile import reconcile
+        path = tmp_path / "tx.csv"
+        path.write_bytes(b"strategy,percentage,amount,charged\n"
+                         b"credit_card,2.5,100.00,102.50\n"
+                         b"credit_card,2.5,\xff100.00,102.50\n"
+                         b"credit_card,2.5,100.00\n"
+                         b"credit_card,2.5,100.00,102.50,extra\n"
+                         b"\n"
+                         b"pay\xfepal,3.0,10.00,10.30\n"
+                         b"paypal,3.0,10.00,10.30\n")
+        result = reconcile(path, workers=1)
+        assert result["credit_card"]["rows"] == 1
+        assert result["credit_card"]["errors"] == 3
+        assert result["pay\ufffdpal"]["errors"] == 1
+        assert result["paypal"]["rows"] == 1 and result["paypal"]["errors"] == 0
+
+    def test_compares_exact_cents(self, tmp_path):
+        from src.reconcile import reconcile
+        path = tmp_path / "tx.csv"
+        # 2.5% of 0.10 is a quarter cent: half-even rounding charges 0.10
+        self._write(path, [("credit_card", 2.5, 0.1, 0.1), ("credit_card", 2.5, 0.1, 0.11)])
+        result = reconcile(path, workers=1)
+        assert result["credit_card"]["mismatches"] == 1
+        assert reconcile(path, workers=1, tolerance_cents=1)["credit_card"]["mismatches"] == 0
+
+
+class TestStrategyRegistry:
+    def test_builtin_names(self):
+        from src.task2_payment import strategies, CreditCardPayment, CryptoPayment
+        assert {"credit_card", "paypal", "crypto"} <= set(strategies.names())
+        assert isinstance(strategies.create("credit_card", 2.5), CreditCardPayment)
+        assert strategies.create("crypto", 5.0).process_payment(100.0) == 95.0
+
+    def test_lazy_import_on_first_lookup(self, monkeypatch):
+        import sys
+        from src.task2_payment import StrategyRegistry
+        registry = StrategyRegistry()
+        registry.register("fake_gateway", "src.payment_async:FakeGateway")
+        registry.register("broken", "no_such_module_xyz:Strategy")
+        assert "broken" in registry
+        monkeypatch.delitem(sys.modules, "src.payment_async", raising=False)
+        factory = registry.get("fake_gateway")
+        assert factory.__name__ == "FakeGateway"
+        assert "src.payment_async" in sys.modules
+        with pytest.raises(ImportError):
+            registry.get("broken")
+
+    def test_import_does_not_load_entry_point_machinery(self):
+        import subprocess
+        import sys
+        from pathlib import Path
+        code = "import sys, src.task2_payment; print('importlib.metadata' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                                text=True, cwd=Path(__file__).parents[2])
+        assert result.stdout.strip() == "False"
+
+    def test_unknown_name(self):
+        from src.task2_payment import StrategyRegistry
+        with pytest.raises(KeyError):
+            StrategyRegistry().get("cash")
+
+
+class TestAsyncPaymentProcessor:
+    def test_checkout_many_preserves_order_and_bounds_concurrency(self):
+        import asyncio
+        from src.task2_payment import CreditCardPayment
+        from src.payment_async import AsyncPaymentProcessor, FakeGateway
+
+        gateway = FakeGateway(CreditCardPayment(2.5), latency=0.01)
+        processor = AsyncPaymentProcessor(gateway, max_concurrency=20)
+        amounts = [float(i) for i in range(100)]
+        results = asyncio.run(processor.checkout_many(amounts))
+        assert results == [CreditCardPayment(2.5).process_payment(a) for a in amounts]
+        assert gateway.calls == 100
+        assert gateway.peak_in_flight == 20
+
+    def test_limit_is_shared_across_concurrent_batches(self):
+        import asyncio
+        from src.task2_payment import CreditCardPayment
+        from src.payment_async import AsyncPaymentProcessor, FakeGateway
+
+        gateway = FakeGateway(CreditCardPayment(2.5), latency=0.005)
+        processor = AsyncPaymentProcessor(gateway, max_concurrency=5)
+
+        async def run():
+            return await asyncio.gather(
+                *(processor.checkout_many([1.0] * 20) for _ in range(4)),
+                *(processor.checkout(2.0) for _ in range(10)),
+            )
+
+        asyncio.run(run())
+        assert gateway.calls == 90
+        assert gateway.peak_in_flight == 5
+        assert gateway.in_flight == 0
+
+    def test_timeout(self):
+        import asyncio
+        from src.task2_payment import PayPalPayment
+        from src.payment_async import AsyncPaymentProcessor, FakeGateway
+
+        processor = AsyncPaymentProcessor(FakeGateway(PayPalPayment(3.0), latency=1.0))
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(processor.checkout(100.0, timeout=0.01))
+
+    def test_cancellation_stops_pending_payments(self):
+        import asyncio
+        from src.task2_payment import CryptoPayment
+        from src.payment_async import AsyncPaymentProcessor, FakeGateway
+
+        gateway = FakeGateway(CryptoPayment(5.0), latency=0.05)
+        processor = AsyncPaymentProcessor(gateway, max_concurrency=2)
+
+        async def run():
+            task = asyncio.ensure_future(processor.checkout_many([1.0] * 50))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert gateway.calls == 2
+
+    def test_processor_survives_a_second_event_loop(self):
+        import asyncio
+        from src.task2_payment import PayPalPayment
+        from src.payment_async import AsyncPaymentProcessor, FakeGateway
+
+        processor = AsyncPaymentProcessor(FakeGateway(PayPalPayment(3.0), latency=0.001),
+                                          max_concurrency=1)
+        amounts = (100.0, 200.0, 300.0)
+
+        async def run():
+            # Contending checkouts bind the semaphore to the running loop
+            return await asyncio.gather(*(processor.checkout(a) for a in amounts))
+
+        for _ in range(2):
+            assert asyncio.run(run()) == [PayPalPayment(3.0).process_payment(a)
+                                          for a in amounts]
+
+
 class TestComposition:
     def test_vehicle_with_features(self):
         """Test vehicle composition with features."""
@@ -140,6 +1004,174 @@ class TestComposition:
             pytest.skip("task3_composition not yet implemented")
 
 
+class TestFeatureTypeIndex:
+    def test_abstract_parents_and_subclasses(self):
+        from src.task3_composition import Vehicle, Engine, Feature, Wheels
+
+        class JetEngine(Engine):
+            def describe(self):
+                return "Jet engine roaring"
+
+        jet = Vehicle("Jet", [JetEngine()])
+        assert jet.has_feature(JetEngine)
+        assert jet.has_feature(Engine)
+        assert jet.has_feature(Feature)
+        assert not jet.has_feature(Wheels)
+        assert not Vehicle("Cart", []).has_feature(Feature)
+
+    def test_index_follows_feature_changes(self):
+        from src.task3_composition import Vehicle, Engine, Wheels
+        wheels = Wheels()
+        car = Vehicle("Car", [Engine()])
+        car.add_feature(wheels)
+        assert car.has_feature(Wheels)
+        car.remove_feature(wheels)
+        assert not car.has_feature(Wheels)
+        car.features = [Wheels()]
+        assert car.has_feature(Wheels) and not car.has_feature(Engine)
+        assert car.describe() == ["Wheels rolling"]
+
+
+class TestFleet:
+    def _fleet(self):
+        from src.task3_composition import Fleet, Vehicle, Engine, Wheels, Wings, Propeller
+        car = Vehicle("Car", [Engine(), Wheels()])
+        boat = Vehicle("Boat", [Engine(), Propeller()])
+        plane = Vehicle("Plane", [Engine(), Wings(), Wheels()])
+        seaplane = Vehicle("Seaplane", [Engine(), Wings()])
+        return Fleet([car, boat, plane, seaplane]), (car, boat, plane, seaplane)
+
+    def test_and_or_not_queries(self):
+        from src.task3_composition import Engine, Feature, Propeller, Wheels, Wings
+        fleet, (car, boat, plane, seaplane) = self._fleet()
+        assert fleet.query(all_of=[Engine, Wings], none_of=[Wheels]) == [seaplane]
+        assert set(fleet.query(any_of=[Wings, Propeller])) == {boat, plane, seaplane}
+        assert fleet.count(all_of=[Feature]) == 4
+        assert fleet.count(none_of=[Engine]) == 0
+
+    def test_unknown_feature_type(self):
+        from src.task3_composition import Engine, Feature
+
+        class Sail(Feature):
+            def describe(self):
+                return "Sail up"
+
+        fleet, _ = self._fleet()
+        assert fleet.query(all_of=[Sail]) == []
+        assert fleet.count(all_of=[Engine], none_of=[Sail]) == 4
+
+    def test_remove_refresh_and_combination_counts(self):
+        from src.task3_composition import Engine, Feature, Wheels, Wings
+        fleet, (car, boat, plane, seaplane) = self._fleet()
+        fleet.remove(car)
+        assert len(fleet) == 3 and car not in fleet
+        seaplane.add_feature(Wheels())
+        fleet.refresh(seaplane)
+        counts = fleet.combination_counts()
+        assert counts[frozenset({Feature, Engine, Wings, Wheels})] == 2
+
+    def test_too_many_feature_types_leaves_fleet_unchanged(self):
+        from src.task3_composition import Feature, Fleet, Vehicle
+
+        def feature_class(i):
+            return type(f"F{i}", (Feature,), {"describe": lambda self: ""})
+
+        fleet = Fleet([Vehicle("Small", [feature_class(i)() for i in range(40)])])
+        big = Vehicle("Big", [feature_class(i)() for i in range(40, 80)])
+        with pytest.raises(ValueError):
+            fleet.add(big)
+        assert len(fleet) == 1 and big not in fleet
+        assert len(fleet._bits) == 41  # 40 features plus Feature itself
+        assert fleet.count(all_of=[Feature]) == 1
+
+
+class TestFeatureIndex:
+    def test_postings_cover_subclasses(self):
+        from src.task3_composition import FeatureIndex, Vehicle, Engine, Feature, Wheels, Wings
+
+        class JetEngine(Engine):
+            def describe(self):
+                return "Jet engine roaring"
+
+        jet = Vehicle("Jet", [JetEngine(), Wings()])
+        car = Vehicle("Car", [Engine(), Wheels()])
+        index = FeatureIndex([jet, car])
+        assert index.with_feature(JetEngine) == {jet}
+        assert index.with_feature(Engine) == {jet, car}
+        assert index.with_all(Engine, Wings) == {jet}
+        assert index.with_all(Feature, Wheels, Wings) == set()
+        assert index.counts()[Feature] == 2
+
+    def test_incremental_maintenance(self):
+        from src.task3_composition import FeatureIndex, Vehicle, Engine, Wheels, Wings
+        wings = Wings()
+        car = Vehicle("Car", [Engine(), Wheels()])
+        index = FeatureIndex([car])
+        car.add_feature(wings)
+        assert index.with_feature(Wings) == {car}
+        car.remove_feature(wings)
+        assert index.with_feature(Wings) == set()
+        index.remove(car)
+        car.add_feature(Wings())
+        assert index.with_feature(Wings) == set() and len(index) == 0
+
+
+class TestSharedFeatures:
+    def test_stateless_features_are_shared(self):
+        from src.task3_composition import Vehicle, Engine, Wheels
+        assert Engine() is Engine()
+        assert Engine() is not Wheels()
+        car, truck = Vehicle("Car", [Engine(), Wheels()]), Vehicle("Truck", [Engine(), Wheels()])
+        assert isinstance(car.features, tuple)
+        assert car.features is truck.features
+
+    def test_only_provably_stateless_features_are_shared(self):
+        from src.task3_composition import Vehicle, Engine, Feature
+
+        class FuelTank(Feature):
+            def __init__(self, litres=50):
+                self.litres = litres
+
+            def describe(self):
+                return f"Fuel tank ({self.litres} L)"
+
+        class Counted(Engine):
+            __slots__ = ()
+            built = 0
+
+            def __init__(self):
+                type(self).built += 1
+
+        class TurboEngine(Engine):
+            __slots__ = ()
+
+        class Tagged(Engine):
+            pass  # has a __dict__, so instances could carry state
+
+        tank = FuelTank()
+        tank.litres = 10
+        assert FuelTank() is not tank and FuelTank().litres == 50
+        assert Counted() is not Counted() and Counted.built == 2
+        assert Tagged() is not Tagged()
+        assert TurboEngine() is TurboEngine() and TurboEngine() is not Engine()
+        van = Vehicle("Van", [Engine(), FuelTank(80)])
+        assert van.describe() == ["Engine started", "Fuel tank (80 L)"]
+        assert van.has_feature(FuelTank)
+
+    def test_combination_caches_are_bounded(self):
+        from src.task3_composition import Vehicle, Engine, Feature, _layout, _type_set
+
+        for i in range(1_500):
+            kind = type(f"Gadget{i}", (Feature,), {"__slots__": (), "describe": lambda self: ""})
+            vehicle = Vehicle("Kit", [kind(), Engine()])
+            assert vehicle.has_feature(kind) and vehicle.has_feature(Engine)
+        assert _layout.cache_info().currsize <= _layout.cache_info().maxsize
+        assert _type_set.cache_info().currsize <= _type_set.cache_info().maxsize
+        # The type set depends only on which classes are present, not their order
+        a, b = Vehicle("A", [Engine(), kind()]), Vehicle("B", [kind(), Engine()])
+        assert a._feature_types is b._feature_types
+
+
 class TestObserver:
     def test_event_emitter_on_emit(self):
         """Test basic event emitter on/emit functionality."""